@@ -0,0 +1,151 @@
+"""
+Shared helper: content-addressed AST parse cache for the examples
+==================================================================
+
+`parse_cached(source)` is a drop-in replacement for `ast.parse(source)`.
+Trees are keyed by a BLAKE2b digest of the source text, so the same
+snippet is only tokenized and parsed once per process.
+
+`fingerprint_cached(path, qualname, extract)` goes one step further for
+real files: the features extracted from one function are kept keyed by the
+file's stat identity, so asking again about an unchanged file is answered
+with a single os.stat() and no parsing at all.
+
+Both caches live for the current process only. Cached trees and features
+are shared between callers — treat them as read-only.
+"""
+
+import ast
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+_PARSE_CACHE: Dict[bytes, ast.Module] = {}
+
+# Parse options are pinned explicitly: no type-comment tokens, and the
+# grammar of the running interpreter.
+_PARSE_KW = dict(type_comments=False, feature_version=sys.version_info[:2])
+
+
+def _source_key(source: str) -> bytes:
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=16).digest()
+
+
+def parse_cached(source: str) -> ast.Module:
+    """Parse `source` like ast.parse(), reusing a cached tree when possible."""
+    key = _source_key(source)
+    tree = _PARSE_CACHE.get(key)
+    if tree is None:
+        tree = ast.parse(source, **_PARSE_KW)
+        _PARSE_CACHE[key] = tree
+    return tree
+
+
+# ---------------------------------------------------------------------------
+# Per-function feature cache
+# ---------------------------------------------------------------------------
+
+_FEATURE_CACHE: Dict[Tuple, Any] = {}
+
+
+def find_function(tree: ast.Module, qualname: str):
+    """Resolve "func" or "Class.method" against module and class bodies."""
+    scope = tree.body
+    *outer, name = qualname.split(".")
+    for part in outer:
+        scope = next((n.body for n in scope
+                      if isinstance(n, ast.ClassDef) and n.name == part), [])
+    for node in scope:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name:
+            return node
+    return None
+
+
+def _fingerprint_key(path: str, qualname: str, extract: Callable) -> Tuple:
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size, st.st_ino,
+            qualname, extract)
+
+
+def _store(key: Tuple, value: Any) -> None:
+    if value is not None:
+        _FEATURE_CACHE[key] = value
+
+
+def _extract_one(path: str, qualname: str, extract: Callable[[ast.AST], Any]) -> Any:
+    """Parse `path` and run `extract` on one function (picklable pool task)."""
+    with open(path, "r", encoding="utf-8") as f:
+        fn_node = find_function(parse_cached(f.read()), qualname)
+    return None if fn_node is None else extract(fn_node)
+
+
+def fingerprint_cached(path: str, qualname: str,
+                       extract: Callable[[ast.AST], Any]) -> Any:
+    """
+    Return extract(<function `qualname` in `path`>), cached in memory.
+
+    The key is (path, mtime_ns, size, inode, qualname, extract), so any
+    edit to the file is a miss. Returns None when the function cannot be
+    found. Cached values are shared between callers — treat them as
+    read-only.
+    """
+    key = _fingerprint_key(path, qualname, extract)
+    if key in _FEATURE_CACHE:
+        return _FEATURE_CACHE[key]
+    value = _extract_one(path, qualname, extract)
+    _store(key, value)
+    return value
+
+
+# Below this many cache misses, process start-up and pickling cost more
+# than the extraction itself.
+PARALLEL_MIN_JOBS = 64
+
+
+def fingerprint_many(jobs: List[Tuple[str, str]],
+                     extract: Callable[[ast.AST], Any],
+                     max_workers: Optional[int] = None) -> List[Any]:
+    """
+    fingerprint_cached() over many (path, qualname) pairs.
+
+    Cache hits are answered in-process; the misses are fanned out to a
+    ProcessPoolExecutor when there are enough of them to be worth it (and
+    extracted serially if the pool cannot start). `extract` must be a module-level function so it can be pickled.
+    """
+    results: List[Any] = [None] * len(jobs)
+    misses = []
+    for i, (path, qualname) in enumerate(jobs):
+        key = _fingerprint_key(path, qualname, extract)
+        if key in _FEATURE_CACHE:
+            results[i] = _FEATURE_CACHE[key]
+        else:
+            misses.append((i, key, path, qualname))
+
+    values = None
+    if len(misses) >= PARALLEL_MIN_JOBS:
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(misses) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                values = list(pool.map(
+                    _extract_one,
+                    [m[2] for m in misses],
+                    [m[3] for m in misses],
+                    [extract] * len(misses),
+                    chunksize=chunksize,
+                ))
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            print(f"Parallel extraction unavailable ({e}); extracting serially.")
+    if values is None:
+        values = [_extract_one(path, qualname, extract)
+                  for _, _, path, qualname in misses]
+
+    for (i, key, _, _), value in zip(misses, values):
+        results[i] = value
+        _store(key, value)
+    return results
+
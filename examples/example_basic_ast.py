@@ -10,6 +10,15 @@ Usage:
 """
 
 import ast
+import functools
+import sys
+
+from _ast_cache import parse_cached
+
+# Block-buffer stdout even on a terminal, so the report goes out in a few
+# large writes instead of one write (and flush) per print() line.
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(line_buffering=False)
 
 
 # ---------------------------------------------------------------------------
@@ -28,7 +37,15 @@ print("=" * 60)
 print("1) PARSING SOURCE CODE INTO AN AST")
 print("=" * 60)
 
-tree = ast.parse(sample_code)
+@functools.cache
+def _sample_tree():
+    # parse_cached() wraps ast.parse(): it returns the same ast.Module, but
+    # reuses an already-parsed tree when it has seen this exact source before.
+    # functools.cache on top skips even the source hashing on repeat calls.
+    return parse_cached(sample_code)
+
+
+tree = _sample_tree()
 
 # ast.dump() gives you the full tree as a string.
 # indent=2 makes it human-readable (Python 3.9+).
@@ -63,10 +80,13 @@ print("=" * 60)
 for node in ast.walk(tree):
     if isinstance(node, ast.FunctionDef):
         for child in ast.walk(node):
-            if isinstance(child, ast.If):
+            # Node classes are concrete, so an exact type() check is enough
+            # (and cheaper than isinstance, which has to consult the MRO).
+            kind = type(child)
+            if kind is ast.If:
                 print(f"\n  Found 'if' statement at line {child.lineno}")
                 print(f"  Test expression type: {type(child.test).__name__}")
-            elif isinstance(child, ast.Return):
+            elif kind is ast.Return:
                 val_type = type(child.value).__name__ if child.value else "None"
                 print(f"  Found 'return' at line {child.lineno}, value type: {val_type}")
 
@@ -82,8 +102,8 @@ print("=" * 60)
 version_a = "def add(a, b):\n    return a + b"
 version_b = "def add(a,b):\n    # this adds two numbers\n    return a+b"
 
-tree_a = ast.parse(version_a)
-tree_b = ast.parse(version_b)
+tree_a = parse_cached(version_a)
+tree_b = parse_cached(version_b)
 
 dump_a = ast.dump(tree_a)
 dump_b = ast.dump(tree_b)
@@ -105,8 +125,8 @@ print("=" * 60)
 code_gt  = "def check(x):\n    if x > 10:\n        return True"
 code_gte = "def check(x):\n    if x >= 10:\n        return True"
 
-tree_gt  = ast.parse(code_gt)
-tree_gte = ast.parse(code_gte)
+tree_gt  = parse_cached(code_gt)
+tree_gte = parse_cached(code_gte)
 
 # Find the comparison operator in each version
 for label, t in [("x > 10 ", tree_gt), ("x >= 10", tree_gte)]:
@@ -132,7 +152,7 @@ sig_v1 = "def fetch(user_id):\n    pass"
 sig_v2 = "def fetch(user_id, include_deleted=False):\n    pass"
 
 for label, code in [("v1", sig_v1), ("v2", sig_v2)]:
-    t = ast.parse(code)
+    t = parse_cached(code)
     for node in ast.walk(t):
         if isinstance(node, ast.FunctionDef):
             params = [a.arg for a in node.args.args]
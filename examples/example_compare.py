@@ -8,9 +8,27 @@ changed and how Docrot would score it.
 
 Usage:
     python examples/example_compare.py
+    python examples/example_compare.py OLD.py NEW.py FUNCTION
+
+With no arguments the two built-in snippets below are compared. Given two
+files and a function name ("func" or "Class.method"), the features are
+read from those files through the shared in-memory feature cache.
 """
 
 import ast
+import functools
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from _ast_cache import fingerprint_many, parse_cached
+
+# Block-buffer stdout even on a terminal, so the report goes out in a few
+# large writes instead of one write (and flush) per print() line.
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(line_buffering=False)
 
 
 # ---------------------------------------------------------------------------
@@ -60,61 +78,201 @@ def process_order(order_id, user_id, use_new_billing=False):
 # Helper to extract features from a function node
 # ---------------------------------------------------------------------------
 
-def extract_features(fn_node):
-    """Extract a simple feature dict from a function AST node."""
-    features = {}
-
-    # Signature
-    features["params"] = [a.arg for a in fn_node.args.args]
-    features["defaults"] = [ast.dump(d) for d in fn_node.args.defaults]
-
-    # Control flow counts
-    features["if_count"] = sum(1 for n in ast.walk(fn_node) if isinstance(n, ast.If))
-    features["for_count"] = sum(1 for n in ast.walk(fn_node) if isinstance(n, ast.For))
-    features["return_count"] = sum(1 for n in ast.walk(fn_node) if isinstance(n, ast.Return))
-
-    # Comparison operators
-    comp_ops = []
-    for n in ast.walk(fn_node):
-        if isinstance(n, ast.Compare):
-            comp_ops.extend(type(op).__name__ for op in n.ops)
-    features["comparison_ops"] = sorted(comp_ops)
-
-    # Calls
-    calls = []
-    for n in ast.walk(fn_node):
-        if isinstance(n, ast.Call):
-            func = n.func
-            if isinstance(func, ast.Name):
-                calls.append(func.id)
-            elif isinstance(func, ast.Attribute):
-                if isinstance(func.value, ast.Name):
-                    calls.append(f"{func.value.id}.{func.attr}")
-    features["calls"] = sorted(calls)
-
-    # Raises
-    raises = []
-    for n in ast.walk(fn_node):
-        if isinstance(n, ast.Raise) and n.exc:
-            if isinstance(n.exc, ast.Call) and isinstance(n.exc.func, ast.Name):
-                raises.append(n.exc.func.id)
-    features["raises"] = raises
-
-    # Except handlers
-    handlers = []
-    for n in ast.walk(fn_node):
-        if isinstance(n, ast.ExceptHandler) and n.type and isinstance(n.type, ast.Name):
-            handlers.append(n.type.id)
-    features["except_handlers"] = handlers
-
-    return features
+# Compare operator classes are a small closed set, so their names are
+# looked up in a table instead of going through type(op).__name__ each time.
+_CMPOP_NAME = {
+    cls: cls.__name__
+    for cls in (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+                ast.Is, ast.IsNot, ast.In, ast.NotIn)
+}
+
+
+class _FeatureCollector:
+    """Tally every feature in a single traversal of the function body."""
+
+    # Fixed attribute layout: counters live in slots rather than a per-instance
+    # __dict__, so every increment in the hot loop is a direct slot access.
+    __slots__ = (
+        "if_count",
+        "for_count",
+        "return_count",
+        "comp_ops",
+        "calls",
+        "raises",
+        "handlers",
+    )
+
+    def __init__(self):
+        self.if_count = 0
+        self.for_count = 0
+        self.return_count = 0
+        self.comp_ops = []
+        self.calls = []
+        self.raises = []
+        self.handlers = []
+
+    def visit_If(self, node):
+        self.if_count += 1
+
+    def visit_For(self, node):
+        self.for_count += 1
+
+    def visit_Return(self, node):
+        self.return_count += 1
+
+    def visit_Compare(self, node):
+        self.comp_ops.extend(_CMPOP_NAME[type(op)] for op in node.ops)
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Name):
+            self.calls.append(func.id)
+        elif isinstance(func, ast.Attribute):
+            if isinstance(func.value, ast.Name):
+                # Interned, so the call sets compare repeated names by identity
+                self.calls.append(sys.intern(func.value.id + "." + func.attr))
+
+    def visit_Raise(self, node):
+        if node.exc:
+            if isinstance(node.exc, ast.Call) and isinstance(node.exc.func, ast.Name):
+                self.raises.append(node.exc.func.id)
+
+    def visit_ExceptHandler(self, node):
+        if node.type and isinstance(node.type, ast.Name):
+            self.handlers.append(node.type.id)
+
+    # Exact-type dispatch: AST node classes are concrete leaves, so one dict
+    # probe per node replaces a chain of isinstance() checks.
+    _HANDLERS = {
+        ast.If: visit_If,
+        ast.For: visit_For,
+        ast.Return: visit_Return,
+        ast.Compare: visit_Compare,
+        ast.Call: visit_Call,
+        ast.Raise: visit_Raise,
+        ast.ExceptHandler: visit_ExceptHandler,
+    }
+
+    def visit(self, fn_node):
+        # Same breadth-first order as ast.walk(), but driven by a plain list
+        # and an index instead of a deque inside a generator frame.
+        handlers = self._HANDLERS
+        iter_children = ast.iter_child_nodes
+        queue = [fn_node]
+        i = 0
+        while i < len(queue):
+            node = queue[i]
+            i += 1
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(self, node)
+            queue.extend(iter_children(node))
+
+
+def _ast_key(node):
+    """
+    Structural key for an expression: nested tuples of node types and field
+    values. Equal keys mean equal trees, without building an ast.dump()
+    string. Plain tuples (not hash()) so keys stay stable across processes
+    and can be sent back from pool workers.
+    """
+    parts = [type(node).__name__]
+    for name in node._fields:
+        value = getattr(node, name, None)
+        if isinstance(value, ast.AST):
+            parts.append(_ast_key(value))
+        elif isinstance(value, list):
+            parts.append(tuple(
+                _ast_key(v) if isinstance(v, ast.AST) else v for v in value
+            ))
+        else:
+            # Tag scalars with their type so True, 1 and 1.0 stay distinct.
+            parts.append((type(value).__name__, value))
+    return tuple(parts)
+
+
+def signature_fingerprint(fn_node):
+    """
+    Everything about a function's public signature, read from fn_node.args
+    alone. Stored as Features.signature, so "did the signature change?" is
+    a single tuple comparison.
+    """
+    args = fn_node.args
+    return (
+        tuple(a.arg for a in args.posonlyargs),
+        tuple(a.arg for a in args.args),
+        tuple(_ast_key(d) for d in args.defaults),
+        args.vararg.arg if args.vararg else None,
+        tuple(a.arg for a in args.kwonlyargs),
+        tuple(_ast_key(d) if d else None for d in args.kw_defaults),
+        args.kwarg.arg if args.kwarg else None,
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class Features:
+    """Fixed-layout feature record for one function version."""
+
+    signature: tuple
+    params: List[str]
+    defaults: Tuple[tuple, ...]
+    default_src: List[str]
+    if_count: int
+    for_count: int
+    return_count: int
+    comparison_ops: Counter
+    calls: Counter
+    raises: List[str]
+    except_handlers: List[str]
 
 
+def extract_features(fn_node):
+    """Extract a Features record from a function AST node."""
+    signature = signature_fingerprint(fn_node)
+
+    # Everything except the signature comes from one pass over the body
+    v = _FeatureCollector()
+    v.visit(fn_node)
+
+    return Features(
+        # Signature
+        signature=signature,
+        params=[a.arg for a in fn_node.args.args],
+        defaults=signature[2],
+        default_src=[ast.unparse(d) for d in fn_node.args.defaults],
+        # Control flow counts
+        if_count=v.if_count,
+        for_count=v.for_count,
+        return_count=v.return_count,
+        # Comparison operators and calls are compared as multisets: a Counter
+        # ignores order (no sort needed) but still tells ['Gt', 'Gt'] from ['Gt'].
+        comparison_ops=Counter(v.comp_ops),
+        calls=Counter(v.calls),
+        # Raises and except handlers
+        raises=v.raises,
+        except_handlers=v.handlers,
+    )
+
+
+# Side-effect keywords, compiled once into a single case-insensitive scan
+SIDE_EFFECT_KEYWORDS = {"db", "billing", "charge", "send", "email", "payment"}
+SIDE_EFFECT_RE = re.compile(
+    "|".join(map(re.escape, sorted(SIDE_EFFECT_KEYWORDS))), re.IGNORECASE
+)
+
+
+@functools.cache
 def get_function(code, name):
-    tree = ast.parse(code)
-    for node in ast.walk(tree):
+    # Only top-level defs and methods are candidates, so look at module and
+    # class bodies instead of walking into every function body.
+    tree = parse_cached(code)
+    for node in tree.body:
         if isinstance(node, ast.FunctionDef) and node.name == name:
             return node
+        if isinstance(node, ast.ClassDef):
+            for sub in node.body:
+                if isinstance(sub, ast.FunctionDef) and sub.name == name:
+                    return sub
     return None
 
 
@@ -122,123 +280,132 @@ def get_function(code, name):
 # Compare
 # ---------------------------------------------------------------------------
 
-fn_v1 = get_function(code_v1, "process_order")
-fn_v2 = get_function(code_v2, "process_order")
-
-feat_v1 = extract_features(fn_v1)
-feat_v2 = extract_features(fn_v2)
-
-print("=" * 65)
-print("COMPARING process_order() — v1 vs v2")
-print("=" * 65)
-
-print("\n--- Feature-by-Feature Comparison ---\n")
-
-total_score = 0
-reasons = []
-critical = False
-
-# 1. Signature
-print("[Signature]")
-print(f"  v1 params:   {feat_v1['params']}")
-print(f"  v2 params:   {feat_v2['params']}")
-print(f"  v1 defaults: {feat_v1['defaults']}")
-print(f"  v2 defaults: {feat_v2['defaults']}")
-
-if feat_v1["params"] != feat_v2["params"] or feat_v1["defaults"] != feat_v2["defaults"]:
-    print("  >> CHANGED: public signature changed → +5 pts (CRITICAL)")
-    total_score += 5
-    reasons.append("public signature changed")
-    critical = True
-else:
-    print("  >> No change.")
-
-# 2. Control flow
-print(f"\n[Control Flow]")
-print(f"  v1: {feat_v1['if_count']} ifs, {feat_v1['for_count']} fors, {feat_v1['return_count']} returns")
-print(f"  v2: {feat_v2['if_count']} ifs, {feat_v2['for_count']} fors, {feat_v2['return_count']} returns")
-
-if feat_v1["if_count"] != feat_v2["if_count"]:
-    diff = feat_v2["if_count"] - feat_v1["if_count"]
-    print(f"  >> CHANGED: {diff:+d} if-branches → +8 pts (core control path, CRITICAL)")
-    total_score += 8
-    reasons.append("core control path added/removed")
-    critical = True
-else:
-    print("  >> No change.")
-
-# 3. Conditions
-print(f"\n[Conditions]")
-print(f"  v1 comparison ops: {feat_v1['comparison_ops']}")
-print(f"  v2 comparison ops: {feat_v2['comparison_ops']}")
-
-if feat_v1["comparison_ops"] != feat_v2["comparison_ops"]:
-    print("  >> CHANGED: condition expression changed → +3 pts")
-    total_score += 3
-    reasons.append("branch condition changed")
-else:
-    print("  >> No change.")
-
-# 4. Calls
-print(f"\n[Calls]")
-print(f"  v1 calls: {feat_v1['calls']}")
-print(f"  v2 calls: {feat_v2['calls']}")
-
-v1_calls = set(feat_v1["calls"])
-v2_calls = set(feat_v2["calls"])
-new_calls = v2_calls - v1_calls
-removed_calls = v1_calls - v2_calls
-
-if new_calls or removed_calls:
-    if new_calls:
-        print(f"  >> NEW calls:     {new_calls}")
-    if removed_calls:
-        print(f"  >> REMOVED calls: {removed_calls}")
-
-    # Check for side-effect changes
-    SIDE_EFFECT_KEYWORDS = {"db", "billing", "charge", "send", "email", "payment"}
-    new_side_effects = [c for c in new_calls if any(k in c.lower() for k in SIDE_EFFECT_KEYWORDS)]
-    if new_side_effects:
-        print(f"  >> Side-effect calls added: {new_side_effects} → +6 pts (CRITICAL)")
-        total_score += 6
-        reasons.append("side-effect behavior changed")
+# Guarded: fingerprint_many() may start a process pool, and under the
+# "spawn" start method its workers re-import this module.
+if __name__ == "__main__":
+    if len(sys.argv) == 4:
+        old_path, new_path, fn_name = sys.argv[1:]
+        feat_v1, feat_v2 = fingerprint_many(
+            [(old_path, fn_name), (new_path, fn_name)], extract_features
+        )
+        if feat_v1 is None or feat_v2 is None:
+            sys.exit(f"Function {fn_name!r} not found in both files.")
+    else:
+        fn_name = "process_order"
+        feat_v1 = extract_features(get_function(code_v1, fn_name))
+        feat_v2 = extract_features(get_function(code_v2, fn_name))
+
+    print("=" * 65)
+    print(f"COMPARING {fn_name}() — v1 vs v2")
+    print("=" * 65)
+
+    print("\n--- Feature-by-Feature Comparison ---\n")
+
+    total_score = 0
+    reasons = []
+    critical = False
+
+    # 1. Signature
+    print("[Signature]")
+    print(f"  v1 params:   {feat_v1.params}")
+    print(f"  v2 params:   {feat_v2.params}")
+    print(f"  v1 defaults: {feat_v1.default_src}")
+    print(f"  v2 defaults: {feat_v2.default_src}")
+
+    if feat_v1.signature != feat_v2.signature:
+        print("  >> CHANGED: public signature changed → +5 pts (CRITICAL)")
+        total_score += 5
+        reasons.append("public signature changed")
+        critical = True
+    else:
+        print("  >> No change.")
+
+    # 2. Control flow
+    print(f"\n[Control Flow]")
+    print(f"  v1: {feat_v1.if_count} ifs, {feat_v1.for_count} fors, {feat_v1.return_count} returns")
+    print(f"  v2: {feat_v2.if_count} ifs, {feat_v2.for_count} fors, {feat_v2.return_count} returns")
+
+    if feat_v1.if_count != feat_v2.if_count:
+        diff = feat_v2.if_count - feat_v1.if_count
+        print(f"  >> CHANGED: {diff:+d} if-branches → +8 pts (core control path, CRITICAL)")
+        total_score += 8
+        reasons.append("core control path added/removed")
+        critical = True
+    else:
+        print("  >> No change.")
+
+    # 3. Conditions
+    print(f"\n[Conditions]")
+    print(f"  v1 comparison ops: {sorted(feat_v1.comparison_ops.elements())}")
+    print(f"  v2 comparison ops: {sorted(feat_v2.comparison_ops.elements())}")
+
+    if feat_v1.comparison_ops != feat_v2.comparison_ops:
+        print("  >> CHANGED: condition expression changed → +3 pts")
+        total_score += 3
+        reasons.append("branch condition changed")
+    else:
+        print("  >> No change.")
+
+    # 4. Calls
+    print(f"\n[Calls]")
+    print(f"  v1 calls: {sorted(feat_v1.calls.elements())}")
+    print(f"  v2 calls: {sorted(feat_v2.calls.elements())}")
+
+    # One symmetric difference over the Counters' key views, then split by
+    # membership, instead of two full set differences.
+    changed_calls = feat_v1.calls.keys() ^ feat_v2.calls.keys()
+    new_calls = {c for c in changed_calls if c in feat_v2.calls}
+    removed_calls = changed_calls - new_calls
+
+    if new_calls or removed_calls:
+        if new_calls:
+            print(f"  >> NEW calls:     {new_calls}")
+        if removed_calls:
+            print(f"  >> REMOVED calls: {removed_calls}")
+
+        # Check for side-effect changes
+        new_side_effects = [c for c in new_calls if SIDE_EFFECT_RE.search(c)]
+        if new_side_effects:
+            print(f"  >> Side-effect calls added: {new_side_effects} → +6 pts (CRITICAL)")
+            total_score += 6
+            reasons.append("side-effect behavior changed")
+            critical = True
+    else:
+        print("  >> No change.")
+
+    # 5. Exceptions
+    print(f"\n[Exceptions]")
+    print(f"  v1 raises:   {feat_v1.raises},  handlers: {feat_v1.except_handlers}")
+    print(f"  v2 raises:   {feat_v2.raises},  handlers: {feat_v2.except_handlers}")
+
+    if feat_v1.raises != feat_v2.raises or feat_v1.except_handlers != feat_v2.except_handlers:
+        print("  >> CHANGED: exception behavior changed → +8 pts (CRITICAL)")
+        total_score += 8
+        reasons.append("exception behavior changed")
         critical = True
-else:
-    print("  >> No change.")
+    else:
+        print("  >> No change.")
 
-# 5. Exceptions
-print(f"\n[Exceptions]")
-print(f"  v1 raises:   {feat_v1['raises']},  handlers: {feat_v1['except_handlers']}")
-print(f"  v2 raises:   {feat_v2['raises']},  handlers: {feat_v2['except_handlers']}")
 
-if feat_v1["raises"] != feat_v2["raises"] or feat_v1["except_handlers"] != feat_v2["except_handlers"]:
-    print("  >> CHANGED: exception behavior changed → +8 pts (CRITICAL)")
-    total_score += 8
-    reasons.append("exception behavior changed")
-    critical = True
-else:
-    print("  >> No change.")
+    # ---------------------------------------------------------------------------
+    # Final scoring summary
+    # ---------------------------------------------------------------------------
 
+    print(f"\n{'=' * 65}")
+    print("SCORING SUMMARY")
+    print(f"{'=' * 65}")
+    print(f"  Total score:  {total_score}")
+    print(f"  Critical:     {critical}")
+    print(f"  Reasons:      {reasons}")
+    print(f"  Substantial:  {total_score >= 4 or critical}  (threshold = 4)")
+    print()
 
-# ---------------------------------------------------------------------------
-# Final scoring summary
-# ---------------------------------------------------------------------------
+    if total_score >= 4 or critical:
+        print("  VERDICT: Documentation mapped to this code should be reviewed!")
+    else:
+        print("  VERDICT: Changes are minor — no doc review needed.")
 
-print(f"\n{'=' * 65}")
-print("SCORING SUMMARY")
-print(f"{'=' * 65}")
-print(f"  Total score:  {total_score}")
-print(f"  Critical:     {critical}")
-print(f"  Reasons:      {reasons}")
-print(f"  Substantial:  {total_score >= 4 or critical}  (threshold = 4)")
-print()
-
-if total_score >= 4 or critical:
-    print("  VERDICT: Documentation mapped to this code should be reviewed!")
-else:
-    print("  VERDICT: Changes are minor — no doc review needed.")
-
-print(f"\n{'=' * 65}")
-print("Try editing code_v1 / code_v2 above and re-running to see how")
-print("different kinds of changes affect the score.")
-print(f"{'=' * 65}")
+    print(f"\n{'=' * 65}")
+    print("Try editing code_v1 / code_v2 above and re-running to see how")
+    print("different kinds of changes affect the score.")
+    print(f"{'=' * 65}")
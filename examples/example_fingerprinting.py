@@ -11,8 +11,18 @@ Usage:
 """
 
 import ast
+import functools
+import re
+import sys
 from typing import List
 
+from _ast_cache import parse_cached
+
+# Block-buffer stdout even on a terminal, so the report goes out in a few
+# large writes instead of one write (and flush) per print() line.
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(line_buffering=False)
+
 
 # ---------------------------------------------------------------------------
 # Sample function to fingerprint
@@ -51,25 +61,144 @@ def get_call_name(node: ast.Call) -> str:
     if isinstance(func, ast.Name):
         return func.id                                    # e.g. send_welcome_email
     elif isinstance(func, ast.Attribute):
+        # Interned, so repeated names share one string object
         if isinstance(func.value, ast.Name):
-            return f"{func.value.id}.{func.attr}"         # e.g. db.insert
-        return f"?.{func.attr}"
+            return sys.intern(func.value.id + "." + func.attr)  # e.g. db.insert
+        return sys.intern("?." + func.attr)
     return "<unknown>"
 
 
+# ---------------------------------------------------------------------------
+# Helper: collect every feature in a single pass over the function
+# ---------------------------------------------------------------------------
+
+# Compare/BoolOp operator classes are a small closed set, so their names are
+# looked up in a table instead of going through type(op).__name__ each time.
+_CMPOP_NAME = {
+    cls: cls.__name__
+    for cls in (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+                ast.Is, ast.IsNot, ast.In, ast.NotIn)
+}
+_BOOLOP_NAME = {ast.And: "And", ast.Or: "Or"}
+
+
+class _FeatureCollector:
+    """Walk a function once, tallying the features each section prints."""
+
+    # Fixed attribute layout: counters live in slots rather than a per-instance
+    # __dict__, so every increment in the hot loop is a direct slot access.
+    __slots__ = (
+        "if_count",
+        "for_count",
+        "while_count",
+        "return_nodes",
+        "comparison_ops",
+        "boolean_ops",
+        "call_names",
+        "raises",
+        "except_handlers",
+        "has_bare_except",
+    )
+
+    def __init__(self):
+        self.if_count = 0
+        self.for_count = 0
+        self.while_count = 0
+        self.return_nodes = []
+        self.comparison_ops = []
+        self.boolean_ops = []
+        self.call_names = []
+        self.raises = []
+        self.except_handlers = []
+        self.has_bare_except = False
+
+    def visit_If(self, node):
+        self.if_count += 1
+
+    def visit_For(self, node):
+        self.for_count += 1
+
+    def visit_While(self, node):
+        self.while_count += 1
+
+    def visit_Return(self, node):
+        self.return_nodes.append(node)
+
+    def visit_Compare(self, node):
+        self.comparison_ops.extend(_CMPOP_NAME[type(op)] for op in node.ops)
+
+    def visit_BoolOp(self, node):
+        self.boolean_ops.append(_BOOLOP_NAME[type(node.op)])
+
+    def visit_Call(self, node):
+        self.call_names.append(get_call_name(node))
+
+    def visit_Raise(self, node):
+        if node.exc:
+            if isinstance(node.exc, ast.Call) and isinstance(node.exc.func, ast.Name):
+                self.raises.append(node.exc.func.id)
+            elif isinstance(node.exc, ast.Name):
+                self.raises.append(node.exc.id)
+
+    def visit_ExceptHandler(self, node):
+        if node.type is None:
+            self.has_bare_except = True
+        elif isinstance(node.type, ast.Name):
+            self.except_handlers.append(node.type.id)
+
+    # Exact-type dispatch: AST node classes are concrete leaves, so one dict
+    # probe per node replaces a chain of isinstance() checks.
+    _HANDLERS = {
+        ast.If: visit_If,
+        ast.For: visit_For,
+        ast.While: visit_While,
+        ast.Return: visit_Return,
+        ast.Compare: visit_Compare,
+        ast.BoolOp: visit_BoolOp,
+        ast.Call: visit_Call,
+        ast.Raise: visit_Raise,
+        ast.ExceptHandler: visit_ExceptHandler,
+    }
+
+    def visit(self, fn_node):
+        # Same breadth-first order as ast.walk(), but driven by a plain list
+        # and an index instead of a deque inside a generator frame.
+        handlers = self._HANDLERS
+        iter_children = ast.iter_child_nodes
+        queue = [fn_node]
+        i = 0
+        while i < len(queue):
+            node = queue[i]
+            i += 1
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(self, node)
+            queue.extend(iter_children(node))
+
+
 # ---------------------------------------------------------------------------
 # Parse + find the function
 # ---------------------------------------------------------------------------
 
-tree = ast.parse(sample_code)
+@functools.cache
+def _sample_tree():
+    """Parse sample_code once per process, however often this is called."""
+    return parse_cached(sample_code)
+
+
+tree = _sample_tree()
 fn_node = None
-for node in ast.walk(tree):
+for node in tree.body:  # top-level defs only; no need to descend into bodies
     if isinstance(node, ast.FunctionDef) and node.name == "create_user":
         fn_node = node
         break
 
 assert fn_node is not None, "Function not found"
 
+# One traversal feeds every section below.
+features = _FeatureCollector()
+features.visit(fn_node)
+
 
 # ---------------------------------------------------------------------------
 # 1. Signature features
@@ -95,41 +224,19 @@ print(f"  Is public:  {not fn_node.name.startswith('_')}")
 # 2. Control-flow features
 # ---------------------------------------------------------------------------
 
-if_count = 0
-for_count = 0
-while_count = 0
-return_count = 0
-
-for child in ast.walk(fn_node):
-    if isinstance(child, ast.If):
-        if_count += 1
-    elif isinstance(child, ast.For):
-        for_count += 1
-    elif isinstance(child, ast.While):
-        while_count += 1
-    elif isinstance(child, ast.Return):
-        return_count += 1
-
 print(f"\n[Control Flow]")
-print(f"  if statements:  {if_count}")
-print(f"  for loops:      {for_count}")
-print(f"  while loops:    {while_count}")
-print(f"  return stmts:   {return_count}")
+print(f"  if statements:  {features.if_count}")
+print(f"  for loops:      {features.for_count}")
+print(f"  while loops:    {features.while_count}")
+print(f"  return stmts:   {len(features.return_nodes)}")
 
 
 # ---------------------------------------------------------------------------
 # 3. Condition features (comparison + boolean operators)
 # ---------------------------------------------------------------------------
 
-comparison_ops = []
-boolean_ops = []
-
-for child in ast.walk(fn_node):
-    if isinstance(child, ast.Compare):
-        for op in child.ops:
-            comparison_ops.append(type(op).__name__)
-    elif isinstance(child, ast.BoolOp):
-        boolean_ops.append(type(child.op).__name__)
+comparison_ops = features.comparison_ops
+boolean_ops = features.boolean_ops
 
 print(f"\n[Conditions]")
 print(f"  Comparison ops: {comparison_ops}")
@@ -140,10 +247,7 @@ print(f"  Boolean ops:    {boolean_ops}")
 # 4. Call features
 # ---------------------------------------------------------------------------
 
-call_names = []
-for child in ast.walk(fn_node):
-    if isinstance(child, ast.Call):
-        call_names.append(get_call_name(child))
+call_names = features.call_names
 
 print(f"\n[Calls]")
 print(f"  All calls: {call_names}")
@@ -158,10 +262,46 @@ FILE_KEYWORDS = {"open", "write", "read_file", "save"}
 NETWORK_KEYWORDS = {"requests", "http", "fetch", "send_email", "send_welcome_email"}
 AUTH_KEYWORDS = {"check_permission", "auth", "login", "verify_token"}
 
-db_calls = [c for c in call_names if any(k in c.lower() for k in DB_KEYWORDS)]
-file_calls = [c for c in call_names if any(k in c.lower() for k in FILE_KEYWORDS)]
-net_calls = [c for c in call_names if any(k in c.lower() for k in NETWORK_KEYWORDS)]
-auth_calls = [c for c in call_names if any(k in c.lower() for k in AUTH_KEYWORDS)]
+
+def keyword_pattern(keywords):
+    """Compile a keyword set into one case-insensitive alternation."""
+    return re.compile("|".join(map(re.escape, sorted(keywords))), re.IGNORECASE)
+
+
+# One regex scan per call name instead of a Python-level `in` per keyword.
+DB_RE = keyword_pattern(DB_KEYWORDS)
+FILE_RE = keyword_pattern(FILE_KEYWORDS)
+NETWORK_RE = keyword_pattern(NETWORK_KEYWORDS)
+AUTH_RE = keyword_pattern(AUTH_KEYWORDS)
+
+# Each distinct call name is classified once into a 4-bit category mask;
+# repeated names (common across a function) are a single dict probe.
+DB_BIT, FILE_BIT, NETWORK_BIT, AUTH_BIT = 1, 2, 4, 8
+_CATEGORY_PATTERNS = (
+    (DB_BIT, DB_RE),
+    (FILE_BIT, FILE_RE),
+    (NETWORK_BIT, NETWORK_RE),
+    (AUTH_BIT, AUTH_RE),
+)
+_mask_cache = {}
+
+
+def category_mask(call_name):
+    mask = _mask_cache.get(call_name)
+    if mask is None:
+        mask = 0
+        for bit, pattern in _CATEGORY_PATTERNS:
+            if pattern.search(call_name):
+                mask |= bit
+        _mask_cache[call_name] = mask
+    return mask
+
+
+masks = [category_mask(c) for c in call_names]
+db_calls = [c for c, m in zip(call_names, masks) if m & DB_BIT]
+file_calls = [c for c, m in zip(call_names, masks) if m & FILE_BIT]
+net_calls = [c for c, m in zip(call_names, masks) if m & NETWORK_BIT]
+auth_calls = [c for c, m in zip(call_names, masks) if m & AUTH_BIT]
 
 print(f"\n[Side Effects]")
 print(f"  DB calls:      {db_calls}")
@@ -174,21 +314,9 @@ print(f"  Auth calls:    {auth_calls}")
 # 6. Exception features
 # ---------------------------------------------------------------------------
 
-raises = []
-except_handlers = []
-has_bare_except = False
-
-for child in ast.walk(fn_node):
-    if isinstance(child, ast.Raise) and child.exc:
-        if isinstance(child.exc, ast.Call) and isinstance(child.exc.func, ast.Name):
-            raises.append(child.exc.func.id)
-        elif isinstance(child.exc, ast.Name):
-            raises.append(child.exc.id)
-    elif isinstance(child, ast.ExceptHandler):
-        if child.type is None:
-            has_bare_except = True
-        elif isinstance(child.type, ast.Name):
-            except_handlers.append(child.type.id)
+raises = features.raises
+except_handlers = features.except_handlers
+has_bare_except = features.has_bare_except
 
 print(f"\n[Exceptions]")
 print(f"  Raises:          {raises}")
@@ -200,7 +328,7 @@ print(f"  Bare except:     {has_bare_except}")
 # 7. Return features
 # ---------------------------------------------------------------------------
 
-return_nodes = [n for n in ast.walk(fn_node) if isinstance(n, ast.Return)]
+return_nodes = features.return_nodes
 returns_none = any(r.value is None for r in return_nodes)
 
 print(f"\n[Returns]")
@@ -8,12 +8,12 @@ MVP output: CI log warnings + a .docrot-report.json artifact.
 Post-MVP: PR comments via GitHub API.
 """
 
-import json
 import os
-from dataclasses import asdict
+from dataclasses import fields
 from typing import Any, Dict, List
 
-from src.config import docs_for_code_path
+from src.config import compile_doc_mappings
+from src.json_io import dumps_pretty
 from src.models import ChangeEvent, DocAlert
 
 
@@ -42,12 +42,17 @@ def evaluate_doc_flags(function_events: List[ChangeEvent],
     per_function_threshold = thresholds.get("per_function_substantial", 4)
     per_doc_threshold = thresholds.get("per_doc_cumulative", 8)
 
-    # Accumulate scores per documentation file
+    # Accumulate scores per documentation file. Reasons and functions are
+    # collected in dicts used as insertion-ordered sets, so duplicates are
+    # dropped as they arrive and first-seen order is kept for the report.
     alerts_by_doc: Dict[str, Dict[str, Any]] = {}
+    docs_for_code_path = compile_doc_mappings(doc_mappings)
 
     for event in function_events:
         # Find which docs are mapped to this code path
-        mapped_docs = docs_for_code_path(event.code_path, doc_mappings)
+        mapped_docs = docs_for_code_path(event.code_path)
+        if not mapped_docs:
+            continue
 
         is_substantial = (event.score >= per_function_threshold) or event.critical
 
@@ -56,33 +61,29 @@ def evaluate_doc_flags(function_events: List[ChangeEvent],
                 alerts_by_doc[doc] = {
                     "cumulative_score": 0,
                     "critical_found": False,
-                    "reasons": [],
-                    "functions": [],
+                    "reasons": {},
+                    "functions": {},
                 }
 
             info = alerts_by_doc[doc]
             info["cumulative_score"] += event.score
             info["critical_found"] = info["critical_found"] or event.critical
-            info["reasons"].extend(event.reasons)
+            info["reasons"].update(dict.fromkeys(event.reasons))
             if is_substantial:
-                info["functions"].append(event.function_id)
+                info["functions"][event.function_id] = None
 
     # Apply per-doc thresholds and build final alerts
     final_alerts: List[DocAlert] = []
     for doc_path, info in sorted(alerts_by_doc.items()):
         should_flag = info["critical_found"] or (info["cumulative_score"] >= per_doc_threshold)
         if should_flag:
-            # De-duplicate reasons and functions
-            unique_reasons = list(dict.fromkeys(info["reasons"]))
-            unique_functions = list(dict.fromkeys(info["functions"]))
-
             final_alerts.append(DocAlert(
                 doc_path=doc_path,
                 message="Code logic changed; review this documentation for potential rot.",
                 cumulative_score=info["cumulative_score"],
                 critical_found=info["critical_found"],
-                reasons=unique_reasons,
-                functions=unique_functions,
+                reasons=list(info["reasons"]),
+                functions=list(info["functions"]),
             ))
 
     return final_alerts
@@ -117,6 +118,16 @@ def publish_alerts_to_log(alerts: List[DocAlert]) -> None:
 REPORT_FILENAME = ".docrot-report.json"
 
 
+# DocAlert is flat (str/int/bool/list-of-str fields), so a shallow field
+# dict serializes the same as dataclasses.asdict() without deep-copying
+# every reasons/functions list.
+_DOC_ALERT_FIELDS = tuple(f.name for f in fields(DocAlert))
+
+
+def _alert_to_dict(alert: DocAlert) -> Dict[str, Any]:
+    return {name: getattr(alert, name) for name in _DOC_ALERT_FIELDS}
+
+
 def publish_alerts_to_report(alerts: List[DocAlert], repo_path: str) -> str:
     """
     Write alerts to a .docrot-report.json file as a CI artifact.
@@ -132,12 +143,12 @@ def publish_alerts_to_report(alerts: List[DocAlert], repo_path: str) -> str:
     report_data = {
         "docrot_report": {
             "alert_count": len(alerts),
-            "alerts": [asdict(alert) for alert in alerts],
+            "alerts": [_alert_to_dict(alert) for alert in alerts],
         }
     }
     try:
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(report_data, f, indent=2, sort_keys=True)
+        with open(report_path, "wb") as f:
+            f.write(dumps_pretty(report_data, sort_keys=True))
         print(f"[docrot] Report written to {report_path}")
     except OSError as e:
         print(f"[docrot] Error: could not write report: {e}")
@@ -7,10 +7,20 @@ change-detection pipeline: source code → AST tree → function nodes.
 """
 
 import ast
+import re
 from typing import Dict, List, Optional, Tuple
 
 from src.models import FunctionFingerprint
 from src.fingerprint import build_fingerprint
+from src.parse_cache import ParseCache, source_digest
+
+
+# Node types compared with `type(node) is ...` in the walks below: ast.parse
+# never produces subclasses, so an identity check is equivalent to
+# isinstance() and skips its MRO/tuple handling in the per-node loop.
+_FD = ast.FunctionDef
+_AFD = ast.AsyncFunctionDef
+_CD = ast.ClassDef
 
 
 def parse_source(source_code: str) -> Optional[ast.Module]:
@@ -44,18 +54,61 @@ def find_function_nodes(tree: ast.Module) -> List[ast.FunctionDef]:
     Returns:
         List of function/method AST nodes.
     """
+    # Same breadth-first order as ast.walk, without its per-node generator
+    # frame and deque: the output order is relied on for stable results.
     function_nodes = []
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            function_nodes.append(node)
+    append = function_nodes.append
+    queue: List[ast.AST] = [tree]
+    extend = queue.extend
+    iter_children = ast.iter_child_nodes
+    for node in queue:
+        t = type(node)
+        if t is _FD or t is _AFD:
+            append(node)
+        extend(iter_children(node))
     return function_nodes
 
 
+def find_functions_with_class(tree: ast.Module) -> List[Tuple[ast.FunctionDef, Optional[str]]]:
+    """
+    Collect every function node together with its enclosing class name
+    in a single traversal.
+
+    This fuses find_function_nodes() and the parent-map lookup used by
+    get_parent_class(): the walk is breadth-first like ast.walk (so the
+    order matches find_function_nodes), and each node is queued alongside
+    its parent, so no separate parent map has to be built.
+
+    Args:
+        tree: Parsed AST module.
+
+    Returns:
+        List of (function node, class name or None) pairs. The class name
+        is set only when the function's direct parent is a ClassDef.
+    """
+    found: List[Tuple[ast.FunctionDef, Optional[str]]] = []
+    nodes: List[ast.AST] = [tree]
+    parents: List[Optional[ast.AST]] = [None]
+    i = 0
+    while i < len(nodes):
+        node = nodes[i]
+        t = type(node)
+        if t is _FD or t is _AFD:
+            parent = parents[i]
+            found.append((node, parent.name if type(parent) is _CD else None))
+        i += 1
+        for child in ast.iter_child_nodes(node):
+            nodes.append(child)
+            parents.append(node)
+    return found
+
+
 def _annotate_parents(tree: ast.Module) -> Dict[int, ast.AST]:
     """
     Walk the AST once and build a mapping of child node id → parent node.
 
-    This allows efficient parent lookups without re-walking.
+    This allows efficient parent lookups without re-walking, and without
+    storing back-references on the (shared) tree itself.
     """
     parent_map: Dict[int, ast.AST] = {}
     for node in ast.walk(tree):
@@ -81,7 +134,7 @@ def get_parent_class(tree: ast.Module, fn_node: ast.FunctionDef,
         parent_map = _annotate_parents(tree)
 
     parent = parent_map.get(id(fn_node))
-    if parent is not None and isinstance(parent, ast.ClassDef):
+    if isinstance(parent, ast.ClassDef):
         return parent.name
     return None
 
@@ -125,9 +178,9 @@ def strip_docstring(body: List[ast.stmt]) -> List[ast.stmt]:
         The body with the leading docstring removed (if present).
     """
     if (body
-            and isinstance(body[0], ast.Expr)
-            and isinstance(body[0].value, ast.Constant)
-            and isinstance(body[0].value.value, str)):
+            and type(body[0]) is ast.Expr
+            and type(body[0].value) is ast.Constant
+            and type(body[0].value.value) is str):
         return body[1:]
     return body
 
@@ -145,19 +198,86 @@ def is_public_function(fn_node: ast.FunctionDef) -> bool:
     return not fn_node.name.startswith("_")
 
 
-def extract_function_fingerprints(source_code: str, file_path: str) -> Dict[str, FunctionFingerprint]:
+_LINE_END_RE = re.compile(r"\r\n|\r|\n")
+
+
+def _line_offsets(source_code: str) -> List[int]:
+    """
+    Return the string index at which each line starts (offsets[i] is the
+    start of line i + 1), splitting on the same line endings as
+    ast.get_source_segment.
+    """
+    offsets = [0]
+    offsets.extend(m.end() for m in _LINE_END_RE.finditer(source_code))
+    return offsets
+
+
+def _char_index(source_code: str, offsets: List[int], lineno: int, col_offset: int) -> int:
+    """Convert an AST (lineno, UTF-8 byte col_offset) position to a string index."""
+    start = offsets[lineno - 1]
+    end = offsets[lineno] if lineno < len(offsets) else len(source_code)
+    line = source_code[start:end]
+    if not line.isascii():
+        col_offset = len(line.encode("utf-8")[:col_offset].decode("utf-8"))
+    return start + col_offset
+
+
+def _source_segment(source_code: str, offsets: List[int], node: ast.AST) -> str:
+    """
+    Same text as ast.get_source_segment(source_code, node), sliced with a
+    precomputed line-offset table instead of re-splitting the whole source
+    for every node.
+    """
+    if node.end_lineno is None or node.end_col_offset is None:
+        return ""
+    start = _char_index(source_code, offsets, node.lineno, node.col_offset)
+    end = _char_index(source_code, offsets, node.end_lineno, node.end_col_offset)
+    return source_code[start:end]
+
+
+def function_source_hash(source_code: str, fn_node: ast.FunctionDef,
+                         offsets: Optional[List[int]] = None) -> str:
+    """
+    Hash the source text of one function (from `def` to its last line).
+
+    These hashes are kept in the parse cache only, whose entries are
+    already tied to the fingerprinting code version, so the bare segment
+    is hashed. Pass `offsets` from _line_offsets() when hashing many
+    functions of the same file.
+    """
+    if offsets is None:
+        offsets = _line_offsets(source_code)
+    return source_digest(_source_segment(source_code, offsets, fn_node))
+
+
+def extract_function_fingerprints(source_code: str, file_path: str,
+                                  cache: Optional[ParseCache] = None,
+                                  prior: Optional[Dict[str, Tuple[str, FunctionFingerprint]]] = None,
+                                  source_hashes: Optional[Dict[str, str]] = None,
+                                  ) -> Dict[str, FunctionFingerprint]:
     """
     High-level entry point: parse source code and return a dict of
     {stable_id: FunctionFingerprint} for every function/method in the file.
 
     This orchestrates:
       1. parse_source()
-      2. find_function_nodes()
+      2. find_functions_with_class() — discovery and class context in one pass
       3. For each node → build fingerprint via fingerprint.build_fingerprint()
 
     Args:
-        source_code: Raw Python source.
-        file_path:   Relative path to the file (used in stable IDs).
+        source_code:   Raw Python source.
+        file_path:     Relative path to the file (used in stable IDs).
+        cache:         Optional ParseCache; on a hit for this exact source
+                       all three steps above are skipped. On a miss, its
+                       previous entry for this path is used as `prior`.
+        prior:         Optional {stable_id: (source_hash, FunctionFingerprint)}
+                       from an earlier version of this file (see
+                       ParseCache.prior). A function whose source text is
+                       unchanged reuses its prior fingerprint instead of
+                       going through build_fingerprint().
+        source_hashes: Optional dict, filled with {stable_id: source_hash}
+                       for every function returned, so the caller can pass
+                       them to ParseCache.store().
 
     Returns:
         Dict mapping stable_id → FunctionFingerprint (from models.py).
@@ -165,19 +285,34 @@ def extract_function_fingerprints(source_code: str, file_path: str) -> Dict[str,
     if source_code is None:
         return {}
 
+    if cache is not None:
+        cached = cache.get(source_code, file_path)
+        if cached is not None:
+            return cached
+        if prior is None:
+            prior = cache.prior(file_path)
+        if source_hashes is None:
+            source_hashes = {}
+
     tree = parse_source(source_code)
     if tree is None:
         return {}
 
-    function_nodes = find_function_nodes(tree)
-    parent_map = _annotate_parents(tree)
     result: Dict[str, FunctionFingerprint] = {}
+    offsets = _line_offsets(source_code)
 
-    for fn_node in function_nodes:
-        class_name = get_parent_class(tree, fn_node, parent_map)
+    for fn_node, class_name in find_functions_with_class(tree):
         stable_id = make_stable_function_id(file_path, fn_node, class_name)
+        source_hash = function_source_hash(source_code, fn_node, offsets)
+        if source_hashes is not None:
+            source_hashes[stable_id] = source_hash
+        previous = prior.get(stable_id) if prior else None
+        if previous is not None and previous[0] == source_hash:
+            result[stable_id] = previous[1]
+            continue
         public = is_public_function(fn_node)
-        fingerprint = build_fingerprint(fn_node, file_path, stable_id, public)
-        result[stable_id] = fingerprint
+        result[stable_id] = build_fingerprint(fn_node, file_path, stable_id, public)
 
+    if cache is not None:
+        cache.put(source_code, file_path, result, source_hashes)
     return result
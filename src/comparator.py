@@ -6,9 +6,10 @@ This is the core logic that decides "did this function change enough
 to potentially make documentation stale?"
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
 from src.models import (
+    SEMANTIC_DELTA_FLAGS,
     ChangeEvent,
     FunctionFingerprint,
     SemanticDelta,
@@ -41,67 +42,83 @@ def diff_features(old_fp: FunctionFingerprint,
     Returns:
         A SemanticDelta with flags set for each type of change detected.
     """
+    # fingerprint_hash covers every feature compared below, so equal hashes
+    # mean no semantic change at all.
+    if old_fp.fingerprint_hash and old_fp.fingerprint_hash == new_fp.fingerprint_hash:
+        return SemanticDelta(only_comment_or_formatting_changes=True)
+
     delta = SemanticDelta()
 
-    # --- Signature changes ---
-    sig_changed = (
-        old_fp.signature.params != new_fp.signature.params
-        or old_fp.signature.name != new_fp.signature.name
-        or old_fp.signature.return_annotation != new_fp.signature.return_annotation
-    )
-    if sig_changed and (old_fp.is_public or new_fp.is_public):
-        delta.public_signature_changed = True
+    # Each category is first compared as a whole feature object: identical
+    # objects (shared via the shape cache or reused from the baseline) and
+    # equal ones skip the per-field checks. Within a category, the fields
+    # that drive one flag are compared as a single tuple.
 
-    # Default argument change (separate from full signature change)
-    if old_fp.signature.defaults != new_fp.signature.defaults:
-        delta.default_arg_changed = True
+    # --- Signature changes ---
+    old_sig = old_fp.signature
+    new_sig = new_fp.signature
+    if old_sig is not new_sig and old_sig != new_sig:
+        sig_changed = (
+            (old_sig.params, old_sig.name, old_sig.return_annotation)
+            != (new_sig.params, new_sig.name, new_sig.return_annotation)
+        )
+        if sig_changed and (old_fp.is_public or new_fp.is_public):
+            delta.public_signature_changed = True
+
+        # Default argument change (separate from full signature change)
+        if old_sig.defaults != new_sig.defaults:
+            delta.default_arg_changed = True
 
     # --- Public API visibility change ---
     if old_fp.is_public != new_fp.is_public:
         delta.public_api_added_or_removed = True
 
     # --- Condition logic changes ---
-    if (old_fp.conditions.comparison_ops != new_fp.conditions.comparison_ops
-            or old_fp.conditions.boolean_ops != new_fp.conditions.boolean_ops):
+    old_cond = old_fp.conditions
+    new_cond = new_fp.conditions
+    if old_cond is not new_cond and old_cond != new_cond:
         delta.condition_logic_changed = True
 
-    # --- Loop semantics changes ---
-    if (old_fp.control_flow.for_count != new_fp.control_flow.for_count
-            or old_fp.control_flow.while_count != new_fp.control_flow.while_count):
-        delta.loop_semantics_changed = True
+    old_cf = old_fp.control_flow
+    new_cf = new_fp.control_flow
+    if old_cf is not new_cf and old_cf != new_cf:
+        # --- Loop semantics changes ---
+        if (old_cf.for_count, old_cf.while_count) != (new_cf.for_count, new_cf.while_count):
+            delta.loop_semantics_changed = True
+
+        # --- Core control path changes ---
+        if ((old_cf.if_count, old_cf.elif_count, old_cf.else_count, old_cf.early_return_count)
+                != (new_cf.if_count, new_cf.elif_count, new_cf.else_count,
+                    new_cf.early_return_count)):
+            delta.core_control_path_added_or_removed = True
 
     # --- Return logic changes ---
-    if (old_fp.returns.return_count != new_fp.returns.return_count
-            or old_fp.returns.returns_none != new_fp.returns.returns_none):
+    old_ret = old_fp.returns
+    new_ret = new_fp.returns
+    if old_ret is not new_ret and old_ret != new_ret:
         delta.return_logic_changed = True
 
-    # --- Core control path changes ---
-    old_cf = old_fp.control_flow
-    new_cf = new_fp.control_flow
-    if (old_cf.if_count != new_cf.if_count
-            or old_cf.elif_count != new_cf.elif_count
-            or old_cf.else_count != new_cf.else_count
-            or old_cf.early_return_count != new_cf.early_return_count):
-        delta.core_control_path_added_or_removed = True
-
-    # --- Side-effect changes ---
-    if (old_fp.side_effects.db_calls != new_fp.side_effects.db_calls
-            or old_fp.side_effects.file_calls != new_fp.side_effects.file_calls
-            or old_fp.side_effects.network_calls != new_fp.side_effects.network_calls):
-        delta.side_effect_changed = True
-
-    # --- Auth/permission logic changes ---
-    if old_fp.side_effects.auth_calls != new_fp.side_effects.auth_calls:
-        delta.auth_or_permission_logic_changed = True
+    old_se = old_fp.side_effects
+    new_se = new_fp.side_effects
+    if old_se is not new_se and old_se != new_se:
+        # --- Side-effect changes ---
+        if ((old_se.db_calls, old_se.file_calls, old_se.network_calls)
+                != (new_se.db_calls, new_se.file_calls, new_se.network_calls)):
+            delta.side_effect_changed = True
+
+        # --- Auth/permission logic changes ---
+        if old_se.auth_calls != new_se.auth_calls:
+            delta.auth_or_permission_logic_changed = True
 
     # --- Exception behavior changes ---
-    if (old_fp.exceptions.raises != new_fp.exceptions.raises
-            or old_fp.exceptions.except_handlers != new_fp.exceptions.except_handlers
-            or old_fp.exceptions.has_bare_except != new_fp.exceptions.has_bare_except):
+    old_exc = old_fp.exceptions
+    new_exc = new_fp.exceptions
+    if old_exc is not new_exc and old_exc != new_exc:
         delta.exception_behavior_changed = True
 
     # --- Literal/constant changes (calls differ but nothing else major) ---
-    if (old_fp.calls.call_names != new_fp.calls.call_names
+    if (old_fp.calls is not new_fp.calls
+            and old_fp.calls.call_names != new_fp.calls.call_names
             and not delta.side_effect_changed
             and not delta.auth_or_permission_logic_changed):
         delta.literal_changed = True
@@ -130,7 +147,71 @@ def diff_features(old_fp: FunctionFingerprint,
 # Scoring engine
 # ---------------------------------------------------------------------------
 
-def score_semantic_delta(delta: SemanticDelta) -> Tuple[int, List[str], bool]:
+def _flag_bit(name: str) -> int:
+    return 1 << SEMANTIC_DELTA_FLAGS.index(name)
+
+
+_COMMENT_ONLY_BIT = _flag_bit("only_comment_or_formatting_changes")
+
+# (flag, weight, reason, critical) — reasons are reported in this order,
+# which is also SemanticDelta's field (bit) order.
+_SCORE_TABLE = [
+    # 1-point minor changes
+    ("literal_changed", SCORE_LITERAL_OR_DEFAULT, "literal/constant changed", False),
+    ("default_arg_changed", SCORE_LITERAL_OR_DEFAULT, "default argument changed", False),
+    # 3-point medium changes
+    ("condition_logic_changed", SCORE_FLOW_OR_RETURN, "branch condition changed", False),
+    ("loop_semantics_changed", SCORE_FLOW_OR_RETURN, "loop behavior changed", False),
+    ("return_logic_changed", SCORE_FLOW_OR_RETURN, "return behavior changed", False),
+    # 5-point API contract changes (critical)
+    ("public_signature_changed", SCORE_PUBLIC_API, "public signature changed", True),
+    ("public_api_added_or_removed", SCORE_PUBLIC_API, "public API added/removed", True),
+    # 6-point side effects / auth changes (critical)
+    ("side_effect_changed", SCORE_SIDE_EFFECT_OR_AUTH, "side-effect behavior changed", True),
+    ("auth_or_permission_logic_changed", SCORE_SIDE_EFFECT_OR_AUTH,
+     "auth/permission logic changed", True),
+    # 8-point high impact control/exception changes (critical)
+    ("exception_behavior_changed", SCORE_EXCEPTION_OR_CORE_PATH,
+     "exception behavior changed", True),
+    ("core_control_path_added_or_removed", SCORE_EXCEPTION_OR_CORE_PATH,
+     "core control path added/removed", True),
+]
+
+_SCORE_BY_BIT: Dict[int, Tuple[int, str]] = {
+    _flag_bit(name): (weight, reason) for name, weight, reason, _ in _SCORE_TABLE
+}
+_CRITICAL_MASK = sum(
+    _flag_bit(name) for name, _, _, critical in _SCORE_TABLE if critical
+)
+
+
+def _score_mask(mask: int) -> Tuple[int, Tuple[str, ...], bool]:
+    """Score one SemanticDelta bitmask (see score_semantic_delta)."""
+    # 0-point noise — if only comments/formatting changed, short-circuit
+    if mask & _COMMENT_ONLY_BIT:
+        return 0, ("format/comment only",), False
+
+    score = 0
+    reasons: List[str] = []
+    is_critical = bool(mask & _CRITICAL_MASK)
+
+    # Visit set bits lowest first, i.e. in _SCORE_TABLE order.
+    while mask:
+        bit = mask & -mask
+        weight, reason = _SCORE_BY_BIT[bit]
+        score += weight
+        reasons.append(reason)
+        mask ^= bit
+
+    return score, tuple(reasons), is_critical
+
+
+# Scoring is a pure function of the flag bits, and there are only
+# 2 ** len(SEMANTIC_DELTA_FLAGS) of those, so every result is computed once.
+_SCORE_CACHE = [_score_mask(mask) for mask in range(1 << len(SEMANTIC_DELTA_FLAGS))]
+
+
+def score_semantic_delta(delta: SemanticDelta) -> Tuple[int, Tuple[str, ...], bool]:
     """
     Apply the weighted scoring model to a SemanticDelta.
 
@@ -142,141 +223,108 @@ def score_semantic_delta(delta: SemanticDelta) -> Tuple[int, List[str], bool]:
       6 pts — side-effect changed, auth/permission changed (CRITICAL)
       8 pts — exception behavior changed, core control path changed (CRITICAL)
 
+    Results come from _SCORE_CACHE, precomputed for every flag combination.
+
     Args:
         delta: The SemanticDelta from diff_features().
 
     Returns:
-        Tuple of (score, reasons_list, is_critical).
+        Tuple of (score, reasons, is_critical). `reasons` is a shared
+        tuple from the cache.
     """
-    score = 0
-    reasons: List[str] = []
-    is_critical = False
-
-    # 0-point noise — if only comments/formatting changed, short-circuit
-    if delta.only_comment_or_formatting_changes:
-        return 0, ["format/comment only"], False
-
-    # 1-point minor changes
-    if delta.literal_changed:
-        score += SCORE_LITERAL_OR_DEFAULT
-        reasons.append("literal/constant changed")
-    if delta.default_arg_changed:
-        score += SCORE_LITERAL_OR_DEFAULT
-        reasons.append("default argument changed")
-
-    # 3-point medium changes
-    if delta.condition_logic_changed:
-        score += SCORE_FLOW_OR_RETURN
-        reasons.append("branch condition changed")
-    if delta.loop_semantics_changed:
-        score += SCORE_FLOW_OR_RETURN
-        reasons.append("loop behavior changed")
-    if delta.return_logic_changed:
-        score += SCORE_FLOW_OR_RETURN
-        reasons.append("return behavior changed")
-
-    # 5-point API contract changes (critical)
-    if delta.public_signature_changed:
-        score += SCORE_PUBLIC_API
-        reasons.append("public signature changed")
-        is_critical = True
-    if delta.public_api_added_or_removed:
-        score += SCORE_PUBLIC_API
-        reasons.append("public API added/removed")
-        is_critical = True
-
-    # 6-point side effects / auth changes (critical)
-    if delta.side_effect_changed:
-        score += SCORE_SIDE_EFFECT_OR_AUTH
-        reasons.append("side-effect behavior changed")
-        is_critical = True
-    if delta.auth_or_permission_logic_changed:
-        score += SCORE_SIDE_EFFECT_OR_AUTH
-        reasons.append("auth/permission logic changed")
-        is_critical = True
-
-    # 8-point high impact control/exception changes (critical)
-    if delta.exception_behavior_changed:
-        score += SCORE_EXCEPTION_OR_CORE_PATH
-        reasons.append("exception behavior changed")
-        is_critical = True
-    if delta.core_control_path_added_or_removed:
-        score += SCORE_EXCEPTION_OR_CORE_PATH
-        reasons.append("core control path added/removed")
-        is_critical = True
-
-    return score, reasons, is_critical
+    return _SCORE_CACHE[delta.to_mask()]
 
 
 # ---------------------------------------------------------------------------
 # File-level comparison
 # ---------------------------------------------------------------------------
 
-def compare_file_functions(old_funcs: Dict[str, FunctionFingerprint],
-                           new_funcs: Dict[str, FunctionFingerprint],
-                           file_path: str) -> List[ChangeEvent]:
+def iter_file_function_changes(old_funcs: Dict[str, FunctionFingerprint],
+                               new_funcs: Dict[str, FunctionFingerprint],
+                               file_path: str) -> Iterator[ChangeEvent]:
     """
-    Compare all functions in a file between old and new snapshots.
+    Yield the ChangeEvents for one file, in sorted function-id order.
 
-    Handles three cases per function:
-      - Added (in new but not old)   → score=5, critical if public
-      - Removed (in old but not new) → score=5, critical if public
-      - Modified (hash differs)      → diff_features → score_semantic_delta
-
-    Functions whose hashes are identical are skipped entirely (no event).
+    Streaming form of compare_file_functions(): callers that gather
+    events across many files can extend one list (or consume the events
+    as they come) instead of building a throwaway list per file.
 
     Args:
         old_funcs: Dict of {stable_id: FunctionFingerprint} from baseline.
         new_funcs: Dict of {stable_id: FunctionFingerprint} freshly extracted.
         file_path: Path to the source file (attached to events).
 
-    Returns:
-        List of ChangeEvent objects for functions that changed.
+    Yields:
+        ChangeEvent objects for functions that changed.
     """
-    events: List[ChangeEvent] = []
-    all_ids = set(old_funcs.keys()) | set(new_funcs.keys())
-
-    for fn_id in sorted(all_ids):
+    # Unchanged functions are removed in bulk: an (id, hash) pair present on
+    # both sides needs no further look, so only added, removed and modified
+    # ids are visited (in sorted order, as before).
+    old_items = {(fn_id, fp.fingerprint_hash) for fn_id, fp in old_funcs.items()}
+    new_items = {(fn_id, fp.fingerprint_hash) for fn_id, fp in new_funcs.items()}
+    changed_ids = {fn_id for fn_id, _ in old_items ^ new_items}
+
+    for fn_id in sorted(changed_ids):
         old_fp = old_funcs.get(fn_id)
         new_fp = new_funcs.get(fn_id)
 
         if old_fp is None and new_fp is not None:
             # Function was added
             if new_fp.is_public:
-                events.append(ChangeEvent(
+                yield ChangeEvent(
                     function_id=fn_id,
                     code_path=file_path,
                     event_type="function_added",
                     score=SCORE_PUBLIC_API,
                     critical=True,
-                    reasons=["function added (public API)"],
-                ))
+                    reasons=("function added (public API)",),
+                )
         elif new_fp is None and old_fp is not None:
             # Function was removed
             if old_fp.is_public:
-                events.append(ChangeEvent(
+                yield ChangeEvent(
                     function_id=fn_id,
                     code_path=file_path,
                     event_type="function_removed",
                     score=SCORE_PUBLIC_API,
                     critical=True,
-                    reasons=["function removed (public API)"],
-                ))
+                    reasons=("function removed (public API)",),
+                )
         elif old_fp is not None and new_fp is not None:
-            # Both exist — compare hashes first (fast path)
-            if old_fp.fingerprint_hash == new_fp.fingerprint_hash:
-                continue  # No change — skip entirely
-
+            # Both exist and the hashes differ
             delta = diff_features(old_fp, new_fp)
             score, reasons, is_critical = score_semantic_delta(delta)
             if score > 0 or is_critical:
-                events.append(ChangeEvent(
+                yield ChangeEvent(
                     function_id=fn_id,
                     code_path=file_path,
                     event_type="semantic_change",
                     score=score,
                     critical=is_critical,
                     reasons=reasons,
-                ))
+                )
+
 
-    return events
+def compare_file_functions(old_funcs: Dict[str, FunctionFingerprint],
+                           new_funcs: Dict[str, FunctionFingerprint],
+                           file_path: str) -> List[ChangeEvent]:
+    """
+    Compare all functions in a file between old and new snapshots.
+
+    Handles three cases per function:
+      - Added (in new but not old)   → score=5, critical if public
+      - Removed (in old but not new) → score=5, critical if public
+      - Modified (hash differs)      → diff_features → score_semantic_delta
+
+    Functions whose hashes are identical are skipped entirely (no event).
+
+    Args:
+        old_funcs: Dict of {stable_id: FunctionFingerprint} from baseline.
+        new_funcs: Dict of {stable_id: FunctionFingerprint} freshly extracted.
+        file_path: Path to the source file (attached to events).
+
+    Returns:
+        List of ChangeEvent objects for functions that changed
+        (see iter_file_function_changes for the streaming form).
+    """
+    return list(iter_file_function_changes(old_funcs, new_funcs, file_path))
@@ -12,6 +12,10 @@ helpers used by the scan pipeline:
      - `per_function_substantial`: minimum function score considered substantial.
      - `per_doc_cumulative`: minimum cumulative score required to flag a doc file.
 
+3) `storage` (optional):
+     - "json" (default): baseline kept in .docrot-fingerprints.json.
+     - "sqlite": baseline kept in .docrot-fingerprints.sqlite (local runs).
+
 Expected config shape:
 {
     "language": "python",
@@ -35,10 +39,15 @@ Threshold behavior:
 Post-MVP: per-module threshold overrides.
 """
 
+import copy
 import fnmatch
+import functools
 import json
 import os
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.json_io import read_json
 
 
 DEFAULT_CONFIG: Dict[str, Any] = {
@@ -49,8 +58,11 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "per_doc_cumulative": 8,
     },
     "ai": None,
+    "storage": "json",
 }
 
+STORAGE_BACKENDS = ("json", "sqlite")
+
 DEFAULT_THRESHOLDS: Dict[str, int] = {
     "per_function_substantial": 4,
     "per_doc_cumulative": 8,
@@ -59,7 +71,36 @@ DEFAULT_THRESHOLDS: Dict[str, int] = {
 CONFIG_FILENAME = ".docrot-config.json"
 
 
-def _parse_positive_threshold(value: Any, key: str, default: int) -> int:
+def _default_config() -> Dict[str, Any]:
+    """
+    Build a fresh default config.
+
+    Cheaper than copy.deepcopy(DEFAULT_CONFIG): only the two mutable
+    values get their own copies, and the rest are immutable. A plain
+    dict(DEFAULT_CONFIG) would share them with the module default.
+    """
+    config = dict(DEFAULT_CONFIG)
+    config["doc_mappings"] = []
+    config["thresholds"] = dict(DEFAULT_THRESHOLDS)
+    return config
+
+
+def _warn_threshold(key: str, value: Any, message: str,
+                    warned: Optional[Set[Tuple[str, str]]] = None) -> None:
+    """
+    Print a threshold warning unless this key/value is already in `warned`,
+    the set of (key, repr(value)) pairs reported during the current load.
+    """
+    if warned is not None:
+        marker = (key, repr(value))
+        if marker in warned:
+            return
+        warned.add(marker)
+    print(f"[docrot] Warning: {message}")
+
+
+def _parse_positive_threshold(value: Any, key: str, default: int,
+                              warned: Optional[Set[Tuple[str, str]]] = None) -> int:
     """
     Parse and validate a threshold value.
 
@@ -67,47 +108,55 @@ def _parse_positive_threshold(value: Any, key: str, default: int) -> int:
         value:   Candidate threshold value from config.
         key:     Threshold key name (for warning messages).
         default: Default value to use on invalid input.
+        warned:  Warnings already printed by this load (see _warn_threshold).
 
     Returns:
         A positive integer threshold.
     """
     if isinstance(value, bool):
-        print(f"[docrot] Warning: invalid threshold '{key}'={value}; using default {default}.")
+        _warn_threshold(key, value, f"invalid threshold '{key}'={value}; using default {default}.", warned)
         return default
 
     try:
         parsed = int(value)
     except (TypeError, ValueError):
-        print(f"[docrot] Warning: invalid threshold '{key}'={value}; using default {default}.")
+        _warn_threshold(key, value, f"invalid threshold '{key}'={value}; using default {default}.", warned)
         return default
 
     if parsed <= 0:
-        print(f"[docrot] Warning: threshold '{key}' must be > 0; using default {default}.")
+        _warn_threshold(key, value, f"threshold '{key}' must be > 0; using default {default}.", warned)
         return default
 
     return parsed
 
 
-def _normalize_thresholds(thresholds: Dict[str, Any]) -> Dict[str, int]:
+def _normalize_thresholds(thresholds: Dict[str, Any],
+                          warned: Optional[Set[Tuple[str, str]]] = None) -> Dict[str, int]:
     """
     Normalize threshold values to validated positive integers.
 
     Args:
         thresholds: Raw thresholds dict from config.
+        warned:     Warnings already printed by this load (see _warn_threshold).
 
     Returns:
         Dict with validated threshold keys.
     """
+    if not thresholds:
+        # Nothing to validate: the common "no thresholds configured" case.
+        return dict(DEFAULT_THRESHOLDS)
     return {
         "per_function_substantial": _parse_positive_threshold(
             thresholds.get("per_function_substantial"),
             "per_function_substantial",
             DEFAULT_THRESHOLDS["per_function_substantial"],
+            warned,
         ),
         "per_doc_cumulative": _parse_positive_threshold(
             thresholds.get("per_doc_cumulative"),
             "per_doc_cumulative",
             DEFAULT_THRESHOLDS["per_doc_cumulative"],
+            warned,
         ),
     }
 
@@ -116,7 +165,10 @@ def load_config(repo_path: str) -> Dict[str, Any]:
     """
     Load configuration from .docrot-config.json in the repo root.
 
-    Falls back to DEFAULT_CONFIG if the file is missing.
+    Falls back to DEFAULT_CONFIG if the file is missing. The parsed file
+    is cached per (path, mtime, size), so repeated calls in one process
+    only re-read it after it changes. Merging and validation still run on
+    every call, so each scan reports the config's problems again.
 
     Args:
         repo_path: Root path of the repository.
@@ -125,15 +177,14 @@ def load_config(repo_path: str) -> Dict[str, Any]:
         Configuration dict with keys: language, doc_mappings, thresholds.
     """
     config_path = os.path.join(repo_path, CONFIG_FILENAME)
-    if not os.path.exists(config_path):
-        return dict(DEFAULT_CONFIG)
-
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            user_config = json.load(f)
+        st = os.stat(config_path)
+        user_config = _read_config_file(config_path, st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return _default_config()
     except (json.JSONDecodeError, OSError) as e:
         print(f"[docrot] Warning: could not read config ({e}); using defaults.")
-        return dict(DEFAULT_CONFIG)
+        return _default_config()
 
     # Merge user config over defaults (shallow merge per top-level key)
     merged: Dict[str, Any] = dict(DEFAULT_CONFIG)
@@ -144,12 +195,27 @@ def load_config(repo_path: str) -> Dict[str, Any]:
     if not isinstance(user_thresholds, dict):
         print("[docrot] Warning: 'thresholds' must be an object; using defaults.")
         user_thresholds = {}
-    merged["thresholds"] = _normalize_thresholds(user_thresholds)
+    merged["thresholds"] = _normalize_thresholds(user_thresholds, set())
 
     # Optional AI configuration — stored as-is; validated at runtime by get_ai_config()
     merged["ai"] = user_config.get("ai", None)
 
-    return merged
+    merged["storage"] = user_config.get("storage", merged["storage"])
+
+    # The parsed file is shared through the cache; hand out a private copy
+    # so callers can still modify what they get back.
+    return copy.deepcopy(merged)
+
+
+@functools.lru_cache(maxsize=16)
+def _read_config_file(config_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Parse one version of a config file. Treat the result as read-only.
+
+    `mtime_ns` and `size` are only part of the cache key: an edited file
+    has a new key and is parsed again. Read errors are raised, not cached.
+    """
+    return read_json(config_path)
 
 
 def get_doc_mappings(config: Dict[str, Any]) -> List[Dict]:
@@ -186,7 +252,7 @@ def get_thresholds(config: Dict[str, Any]) -> Dict[str, int]:
     thresholds = config.get("thresholds", DEFAULT_THRESHOLDS)
     if not isinstance(thresholds, dict):
         return dict(DEFAULT_THRESHOLDS)
-    return _normalize_thresholds(thresholds)
+    return _normalize_thresholds(thresholds, set())
 
 
 def get_threshold_info(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
@@ -222,6 +288,19 @@ def get_threshold_info(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     }
 
 
+def get_storage_backend(config: Dict[str, Any]) -> str:
+    """
+    Return the fingerprint baseline backend: "json" or "sqlite".
+
+    Unknown values fall back to "json" with a warning.
+    """
+    storage = config.get("storage", "json")
+    if storage not in STORAGE_BACKENDS:
+        print(f"[docrot] Warning: unknown storage '{storage}'; using json.")
+        return "json"
+    return storage
+
+
 def is_ai_disabled(config: Dict[str, Any]) -> bool:
     """Return True if the user has explicitly opted out of AI suggestions.
 
@@ -268,6 +347,104 @@ def get_ai_config(config: Dict[str, Any]) -> Optional[Dict[str, str]]:
     }
 
 
+# Bounds for the process-wide caches below. The webhook server runs for
+# days against many repositories, so none of them may grow without limit.
+_GLOB_CACHE_SIZE = 256
+_MATCHER_CACHE_SIZE = 32
+_MATCH_MEMO_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_GLOB_CACHE_SIZE)
+def _compile_glob(pattern: str) -> Callable[[str], Any]:
+    """
+    Compile a code_glob into a matcher equivalent to fnmatch.fnmatch().
+
+    Cached per pattern (least recently used first out), so each glob in
+    the config is translated and compiled once however many matchers
+    are built from it.
+    """
+    return re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _glob_prefix(code_glob: str) -> Optional[str]:
+    """
+    Return the literal first path segment of a glob, or None when that
+    segment contains wildcards. A literal segment must equal the first
+    segment of every path the glob matches (fnmatch anchors both ends).
+    """
+    first = code_glob.split("/", 1)[0]
+    if _GLOB_CHARS.intersection(first):
+        return None
+    return os.path.normcase(first)
+
+
+def _build_matcher(mappings: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Callable[[str], List[str]]:
+    """
+    Build a memoizing code-path → docs matcher for frozen mappings.
+
+    Mappings are bucketed by the literal first segment of their glob, so
+    a path is only tested against globs rooted at its own top-level
+    directory plus those starting with a wildcard. Candidates are checked
+    in mapping order, so the docs come out in config order as before.
+    The per-path memo keeps at most _MATCH_MEMO_SIZE paths.
+    """
+    buckets: Dict[str, List[int]] = {}
+    wildcard: List[int] = []
+    compiled = []
+    for index, (code_glob, docs) in enumerate(mappings):
+        compiled.append((_compile_glob(code_glob), docs))
+        prefix = _glob_prefix(code_glob)
+        if prefix is None:
+            wildcard.append(index)
+        else:
+            buckets.setdefault(prefix, []).append(index)
+
+    @functools.lru_cache(maxsize=_MATCH_MEMO_SIZE)
+    def match(code_path: str) -> List[str]:
+        # Callers pass posix paths; only rewrite stray backslashes.
+        slashed = code_path.replace("\\", "/") if "\\" in code_path else code_path
+        normalized_path = os.path.normcase(slashed)
+        bucket = buckets.get(os.path.normcase(slashed.split("/", 1)[0]), [])
+        matched = {}
+        for index in sorted(bucket + wildcard):
+            matches, mapped = compiled[index]
+            if matches(normalized_path):
+                matched.update(dict.fromkeys(mapped))
+        return list(matched)
+
+    return match
+
+
+_cached_matcher = functools.lru_cache(maxsize=_MATCHER_CACHE_SIZE)(_build_matcher)
+
+
+def compile_doc_mappings(doc_mappings: List[Dict]) -> Callable[[str], List[str]]:
+    """
+    Build a reusable docs_for_code_path() for one set of mappings.
+
+    Every code_glob is compiled once up front, and results are memoized
+    per code path, since many change events usually come from the same
+    file. Matchers are cached by mapping content, so every caller in a
+    run that passes the same doc_mappings shares one memo. The returned
+    lists are shared — treat them as read-only.
+
+    Args:
+        doc_mappings: List of mapping dicts from config.
+
+    Returns:
+        A function taking a code path and returning its mapped doc files
+        (same result as docs_for_code_path).
+    """
+    frozen = tuple(
+        (mapping.get("code_glob", ""), tuple(mapping.get("docs", [])))
+        for mapping in doc_mappings
+    )
+    return _cached_matcher(frozen)
+
+
 def docs_for_code_path(code_path: str, doc_mappings: List[Dict]) -> List[str]:
     """
     Given a source file path, return all documentation files mapped to it.
@@ -275,30 +452,11 @@ def docs_for_code_path(code_path: str, doc_mappings: List[Dict]) -> List[str]:
     Uses fnmatch/glob-style matching on the code_glob patterns.
 
     Args:
-        code_path:    Relative path to the changed source file.
+        code_path:    Relative path to the changed source file, with "/"
+                      separators (as produced by the scanner).
         doc_mappings: List of mapping dicts from config.
 
     Returns:
         De-duplicated list of doc file paths that should be flagged.
     """
-    matched_docs: List[str] = []
-    # Normalize path separators to forward slashes for consistent matching
-    normalized_path = code_path.replace("\\", "/")
-
-    for mapping in doc_mappings:
-        pattern = mapping.get("code_glob", "")
-        docs = mapping.get("docs", [])
-        # fnmatch works on individual path components; for glob-like ** patterns
-        # we use fnmatch with the full path
-        if fnmatch.fnmatch(normalized_path, pattern):
-            matched_docs.extend(docs)
-
-    # De-duplicate while preserving order
-    seen: set = set()
-    unique_docs: List[str] = []
-    for doc in matched_docs:
-        if doc not in seen:
-            seen.add(doc)
-            unique_docs.append(doc)
-
-    return unique_docs
+    return list(compile_doc_mappings(doc_mappings)(code_path))
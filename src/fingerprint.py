@@ -8,10 +8,15 @@ side-effects, exceptions, returns).
 """
 
 import ast
-import copy
+import functools
 import hashlib
 import json
-from typing import List, Optional
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from src.models import (
     CallFeatures,
@@ -24,36 +29,46 @@ from src.models import (
     SignatureFeatures,
 )
 
+try:  # Optional accelerator for the shape digest; blake2b is the fallback.
+    import blake3
+except ImportError:
+    blake3 = None
+
 
 # ---------------------------------------------------------------------------
 # Side-effect keyword classifiers
 # ---------------------------------------------------------------------------
 
-_DB_KEYWORDS = {
+def _keywords(words: set) -> frozenset:
+    """Freeze a keyword set, interning its members (call names are interned too)."""
+    return frozenset(sys.intern(word) for word in words)
+
+
+_DB_KEYWORDS = _keywords({
     "execute", "executemany", "commit", "rollback", "cursor",
     "query", "fetchone", "fetchall", "fetchmany",
     "insert", "update", "delete", "create_engine", "session",
-}
+})
 
-_FILE_KEYWORDS = {
+_FILE_KEYWORDS = _keywords({
     "open", "read", "write", "close", "readlines", "writelines",
     "readline", "seek", "truncate", "flush", "mkdir", "makedirs",
     "remove", "unlink", "rename", "rmdir", "rmtree", "copyfile",
     "shutil.copy", "shutil.move", "pathlib",
-}
+})
 
-_NETWORK_KEYWORDS = {
+_NETWORK_KEYWORDS = _keywords({
     "get", "post", "put", "patch", "delete", "head", "options",
     "request", "urlopen", "fetch", "send", "recv", "connect",
     "socket", "requests", "httpx", "aiohttp", "urllib",
-}
+})
 
-_AUTH_KEYWORDS = {
+_AUTH_KEYWORDS = _keywords({
     "login", "logout", "authenticate", "authorize", "auth",
     "permission", "permissions", "check_permission", "has_perm",
     "is_authenticated", "token", "jwt", "verify_token", "hash_password",
     "check_password", "set_password", "create_user",
-}
+})
 
 
 # ---------------------------------------------------------------------------
@@ -202,18 +217,25 @@ def extract_condition_features(fn_node: ast.FunctionDef) -> ConditionFeatures:
 def _resolve_call_name(node: ast.Call) -> str:
     """Resolve a Call node's function to a dotted name string."""
     func = node.func
-    if isinstance(func, ast.Name):
+    func_type = type(func)
+    if func_type is ast.Name:
         return func.id
-    elif isinstance(func, ast.Attribute):
-        parts = []
-        current = func
+    elif func_type is ast.Attribute:
+        value = func.value
+        if type(value) is ast.Name:
+            # obj.method() — by far the most common attribute call; no list.
+            return sys.intern(f"{value.id}.{func.attr}")
+        parts = [func.attr]
+        current = value
         while isinstance(current, ast.Attribute):
             parts.append(current.attr)
             current = current.value
         if isinstance(current, ast.Name):
             parts.append(current.id)
         parts.reverse()
-        return ".".join(parts)
+        # Dotted names are built fresh per call site; intern so repeats
+        # across functions share one object (identifiers already are).
+        return sys.intern(".".join(parts))
     return "<unknown>"
 
 
@@ -240,14 +262,9 @@ def extract_call_features(fn_node: ast.FunctionDef) -> CallFeatures:
     return CallFeatures(call_names=call_names)
 
 
-def _classify_call(name: str, keyword_set: set) -> bool:
+def _classify_call(name: str, keyword_set: frozenset) -> bool:
     """Check if any part of the call name matches a keyword set."""
-    name_lower = name.lower()
-    parts = name_lower.split(".")
-    for part in parts:
-        if part in keyword_set:
-            return True
-    return False
+    return not keyword_set.isdisjoint(name.lower().split("."))
 
 
 def extract_side_effect_features(fn_node: ast.FunctionDef) -> SideEffectFeatures:
@@ -378,10 +395,267 @@ def extract_return_features(fn_node: ast.FunctionDef) -> ReturnFeatures:
     )
 
 
+# ---------------------------------------------------------------------------
+# Fused extraction — all body-walking extractors in one traversal
+# ---------------------------------------------------------------------------
+
+class _FeatureAccumulator:
+    """Running counters/lists for extract_all_features()."""
+
+    __slots__ = (
+        "if_count", "elif_count", "else_count", "for_count", "while_count",
+        "return_count", "returns_none",
+        "comparison_ops", "boolean_ops",
+        "call_names", "db_calls", "file_calls", "network_calls", "auth_calls",
+        "raises", "except_handlers", "has_bare_except",
+    )
+
+    def __init__(self) -> None:
+        self.if_count = 0
+        self.elif_count = 0
+        self.else_count = 0
+        self.for_count = 0
+        self.while_count = 0
+        self.return_count = 0
+        self.returns_none = False
+        self.comparison_ops: List[str] = []
+        self.boolean_ops: List[str] = []
+        self.call_names: List[str] = []
+        self.db_calls: List[str] = []
+        self.file_calls: List[str] = []
+        self.network_calls: List[str] = []
+        self.auth_calls: List[str] = []
+        self.raises: List[str] = []
+        self.except_handlers: List[str] = []
+        self.has_bare_except = False
+
+
+def _h_if(acc: _FeatureAccumulator, node: ast.If) -> None:
+    acc.if_count += 1
+    orelse = node.orelse
+    for child in orelse:
+        if isinstance(child, ast.If):
+            acc.elif_count += 1
+    if orelse and not isinstance(orelse[0], ast.If):
+        acc.else_count += 1
+
+
+def _h_for(acc: _FeatureAccumulator, node: ast.For) -> None:
+    acc.for_count += 1
+    if node.orelse:
+        acc.else_count += 1
+
+
+def _h_while(acc: _FeatureAccumulator, node: ast.While) -> None:
+    acc.while_count += 1
+    if node.orelse:
+        acc.else_count += 1
+
+
+def _h_return(acc: _FeatureAccumulator, node: ast.Return) -> None:
+    acc.return_count += 1
+    value = node.value
+    if value is None or (isinstance(value, ast.Constant) and value.value is None):
+        acc.returns_none = True
+
+
+def _h_compare(acc: _FeatureAccumulator, node: ast.Compare) -> None:
+    acc.comparison_ops.extend(type(op).__name__ for op in node.ops)
+
+
+def _h_boolop(acc: _FeatureAccumulator, node: ast.BoolOp) -> None:
+    acc.boolean_ops.append(type(node.op).__name__)
+
+
+_ALL_SIDE_EFFECT_KEYWORDS = _DB_KEYWORDS | _FILE_KEYWORDS | _NETWORK_KEYWORDS | _AUTH_KEYWORDS
+_NO_CATEGORIES = (False, False, False, False)
+
+
+@functools.lru_cache(maxsize=4096)
+def _call_categories(name: str) -> Tuple[bool, bool, bool, bool]:
+    """
+    (db, file, network, auth) membership of a call name — the same test
+    as _classify_call() against each keyword set, with the name split
+    once. Call names repeat heavily across a repo, hence the cache.
+    """
+    parts = name.lower().split(".")
+    if _ALL_SIDE_EFFECT_KEYWORDS.isdisjoint(parts):
+        return _NO_CATEGORIES  # len(), str(), self.helper() ...
+    return (
+        not _DB_KEYWORDS.isdisjoint(parts),
+        not _FILE_KEYWORDS.isdisjoint(parts),
+        not _NETWORK_KEYWORDS.isdisjoint(parts),
+        not _AUTH_KEYWORDS.isdisjoint(parts),
+    )
+
+
+def _h_call(acc: _FeatureAccumulator, node: ast.Call) -> None:
+    # Each Call node is visited once in the fused walk, so its name is
+    # resolved exactly once and shared by all five lists.
+    name = _resolve_call_name(node)
+    acc.call_names.append(name)
+    is_db, is_file, is_network, is_auth = _call_categories(name)
+    if is_db:
+        acc.db_calls.append(name)
+    if is_file:
+        acc.file_calls.append(name)
+    if is_network:
+        acc.network_calls.append(name)
+    if is_auth:
+        acc.auth_calls.append(name)
+
+
+def _h_raise(acc: _FeatureAccumulator, node: ast.Raise) -> None:
+    exc = node.exc
+    if exc is None:
+        acc.raises.append("re-raise")
+    elif isinstance(exc, ast.Call) and isinstance(exc.func, ast.Name):
+        acc.raises.append(exc.func.id)
+    elif isinstance(exc, ast.Name):
+        acc.raises.append(exc.id)
+    else:
+        acc.raises.append(ast.dump(exc))
+
+
+def _h_except(acc: _FeatureAccumulator, node: ast.ExceptHandler) -> None:
+    exc_type = node.type
+    if exc_type is None:
+        acc.has_bare_except = True
+    elif isinstance(exc_type, ast.Name):
+        acc.except_handlers.append(exc_type.id)
+    elif isinstance(exc_type, ast.Tuple):
+        for elt in exc_type.elts:
+            if isinstance(elt, ast.Name):
+                acc.except_handlers.append(elt.id)
+    else:
+        acc.except_handlers.append(ast.dump(exc_type))
+
+
+# Exact node type → handler. The parser only emits these concrete classes,
+# so one dict lookup replaces each extractor's isinstance chain.
+_FEATURE_HANDLERS = {
+    ast.If: _h_if,
+    ast.For: _h_for,
+    ast.While: _h_while,
+    ast.Return: _h_return,
+    ast.Compare: _h_compare,
+    ast.BoolOp: _h_boolop,
+    ast.Call: _h_call,
+    ast.Raise: _h_raise,
+    ast.ExceptHandler: _h_except,
+}
+
+
+# Fields that never lead to a node with a handler: identifiers and other
+# scalars, expression contexts (Load/Store/Del) and operator nodes. The
+# handlers read operators off their parent (Compare.ops, BoolOp.op).
+_LEAF_FIELDS = frozenset({
+    "ctx", "op", "ops", "id", "arg", "attr", "name", "names", "module",
+    "level", "kind", "type_comment", "conversion", "is_async", "simple",
+})
+
+# Per node class, the fields extract_all_features() descends into,
+# resolved once here instead of reflecting over _fields per node.
+# Constant's `value` is a Python literal, so it has nothing to visit.
+_WALK_FIELDS = {
+    cls: tuple(name for name in cls._fields if name not in _LEAF_FIELDS)
+    for cls in vars(ast).values()
+    if isinstance(cls, type) and issubclass(cls, ast.AST)
+}
+_WALK_FIELDS[ast.Constant] = ()
+
+
+def extract_all_features(fn_node: ast.FunctionDef) -> Tuple[
+        SignatureFeatures, ControlFlowFeatures, ConditionFeatures, CallFeatures,
+        SideEffectFeatures, ExceptionFeatures, ReturnFeatures]:
+    """
+    Run every feature extractor above in a single walk of the function.
+
+    Produces exactly what the seven extract_* functions produce when
+    called one by one, but visits each node once and classifies each
+    call once. All collected lists are sorted, so visiting order (here
+    depth-first, unlike ast.walk) does not affect the result.
+
+    Args:
+        fn_node: A (normalized) FunctionDef AST node.
+
+    Returns:
+        Tuple of (signature, control_flow, conditions, calls,
+        side_effects, exceptions, returns) feature dataclasses.
+    """
+    acc = _FeatureAccumulator()
+    handlers = _FEATURE_HANDLERS
+    walk_fields = _WALK_FIELDS
+    AST = ast.AST
+    # Iterative DFS over an explicit list instead of ast.walk's generator
+    # and deque; only the fields that can hold relevant nodes are read.
+    stack = [fn_node]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node = pop()
+        node_type = type(node)
+        handler = handlers.get(node_type)
+        if handler is not None:
+            handler(acc, node)
+        fields = walk_fields.get(node_type)
+        if fields is None:
+            fields = node._fields
+        for name in fields:
+            child = getattr(node, name, None)
+            if type(child) is list:
+                for item in child:
+                    if isinstance(item, AST):
+                        push(item)
+            elif isinstance(child, AST):
+                push(child)
+
+    for values in (acc.comparison_ops, acc.boolean_ops, acc.call_names,
+                   acc.db_calls, acc.file_calls, acc.network_calls,
+                   acc.auth_calls, acc.raises, acc.except_handlers):
+        values.sort()
+
+    return (
+        extract_signature_features(fn_node),
+        ControlFlowFeatures(
+            if_count=acc.if_count,
+            elif_count=acc.elif_count,
+            else_count=acc.else_count,
+            for_count=acc.for_count,
+            while_count=acc.while_count,
+            early_return_count=acc.return_count,
+        ),
+        ConditionFeatures(
+            comparison_ops=acc.comparison_ops,
+            boolean_ops=acc.boolean_ops,
+        ),
+        CallFeatures(call_names=acc.call_names),
+        SideEffectFeatures(
+            db_calls=acc.db_calls,
+            file_calls=acc.file_calls,
+            network_calls=acc.network_calls,
+            auth_calls=acc.auth_calls,
+        ),
+        ExceptionFeatures(
+            raises=acc.raises,
+            except_handlers=acc.except_handlers,
+            has_bare_except=acc.has_bare_except,
+        ),
+        ReturnFeatures(
+            return_count=acc.return_count,
+            returns_none=acc.returns_none,
+        ),
+    )
+
+
 # ---------------------------------------------------------------------------
 # Normalization
 # ---------------------------------------------------------------------------
 
+# Per-node memo of normalize_function_ast(); entries go away with their tree.
+_normalized_nodes: "WeakKeyDictionary[ast.AST, ast.FunctionDef]" = WeakKeyDictionary()
+
+
 def normalize_function_ast(fn_node: ast.FunctionDef) -> ast.FunctionDef:
     """
     Remove non-semantic noise from a function's AST so that
@@ -392,22 +666,32 @@ def normalize_function_ast(fn_node: ast.FunctionDef) -> ast.FunctionDef:
       - (Post-MVP) Alpha-rename local variables to canonical names
       - (Post-MVP) Normalize import ordering if relevant
 
+    Nothing is deep-copied: the extractors only read the tree, so the
+    result shares every child node with `fn_node`. Without a docstring
+    that is `fn_node` itself; otherwise a shallow copy of the def node
+    whose body skips the docstring (memoized per node while it is alive).
+    Treat the result as read-only.
+
     Args:
-        fn_node: The raw FunctionDef AST node.
+        fn_node: The raw FunctionDef AST node (left unmodified).
 
     Returns:
-        A cleaned copy of the node (or the same node, mutated).
+        The normalized node.
     """
-    # Deep copy to avoid mutating the original tree
-    normalized = copy.deepcopy(fn_node)
-
-    # Strip leading docstring from the function body
-    if (normalized.body
-            and isinstance(normalized.body[0], ast.Expr)
-            and isinstance(normalized.body[0].value, ast.Constant)
-            and isinstance(normalized.body[0].value.value, str)):
-        normalized.body = normalized.body[1:]
-
+    body = fn_node.body
+    if not (body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)):
+        return fn_node
+
+    normalized = _normalized_nodes.get(fn_node)
+    if normalized is None:
+        # Same def node type and fields (FunctionDef / AsyncFunctionDef),
+        # minus the leading docstring.
+        normalized = type(fn_node)(**{name: getattr(fn_node, name, None) for name in fn_node._fields})
+        normalized.body = body[1:]
+        _normalized_nodes[fn_node] = normalized
     return normalized
 
 
@@ -432,6 +716,92 @@ def stable_hash(features: dict) -> str:
     return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
 
+# ---------------------------------------------------------------------------
+# Shape memoization
+# ---------------------------------------------------------------------------
+
+# Functions with an identical AST (boilerplate __repr__s, trivial getters,
+# generated code) have identical features. Everything build_fingerprint
+# derives besides stable_id/file_path is a pure function of the node's
+# shape and is_public, so it is cached on a structural digest of the node.
+# The cached feature objects are shared between fingerprints and must be
+# treated as read-only.
+_SHAPE_CACHE_SIZE = 8192
+_shape_cache: "OrderedDict[Tuple[bytes, bool], tuple]" = OrderedDict()
+# The webhook server fingerprints several repos at once from worker threads;
+# every read, update and eviction of the two caches happens under this lock.
+_shape_cache_lock = threading.Lock()
+
+# In-process L1 in front of _shape_cache: the core computed for a node
+# object, so fingerprinting the same node again skips even _shape_key().
+_node_cores: "WeakKeyDictionary[ast.AST, Tuple[bool, tuple]]" = WeakKeyDictionary()
+
+# Every AST node class gets a fixed 16-bit opcode for the shape stream.
+_NODE_OPCODE = {
+    cls: i
+    for i, cls in enumerate(
+        sorted(
+            (c for c in vars(ast).values()
+             if isinstance(c, type) and issubclass(c, ast.AST)),
+            key=lambda c: c.__name__,
+        ),
+        start=1,
+    )
+}
+
+# Per node class: (packed opcode, field names in reverse), resolved once
+# here rather than per node inside _shape_key().
+_NODE_INFO = {
+    cls: (struct.pack("<H", code), tuple(reversed(cls._fields)))
+    for cls, code in _NODE_OPCODE.items()
+}
+
+_TAG_LIST = 1
+_TAG_NONE = 2
+_TAG_VALUE = 3
+
+
+def _new_hasher():
+    if blake3 is not None:
+        return blake3.blake3()
+    return hashlib.blake2b(digest_size=16)
+
+
+def _shape_key(fn_node: ast.FunctionDef) -> bytes:
+    """
+    Structural digest of a function node, streamed straight into the hasher.
+
+    Pre-order, each node contributes its opcode, each list its length and
+    each scalar field (identifiers, constants) a type-tagged, length-prefixed
+    repr. Node field counts are fixed per type, so the stream is unambiguous
+    and two nodes share a key only if they are structurally identical.
+    Positions (lineno/col_offset) are not fields and never enter the stream.
+    """
+    h = _new_hasher()
+    update = h.update
+    pack = struct.pack
+    node_info = _NODE_INFO
+    stack: list = [fn_node]
+    while stack:
+        item = stack.pop()
+        item_type = type(item)
+        info = node_info.get(item_type)
+        if info is not None:
+            packed_opcode, fields = info
+            update(packed_opcode)
+            stack.extend(getattr(item, name, None) for name in fields)
+        elif item_type is list:
+            update(pack("<BI", _TAG_LIST, len(item)))
+            stack.extend(reversed(item))
+        elif item is None:
+            update(pack("<B", _TAG_NONE))
+        else:
+            value = f"{type(item).__name__}:{item!r}".encode("utf-8", "surrogatepass")
+            update(pack("<BI", _TAG_VALUE, len(value)))
+            update(value)
+    return h.digest()
+
+
 # ---------------------------------------------------------------------------
 # High-level builder
 # ---------------------------------------------------------------------------
@@ -442,6 +812,8 @@ def build_fingerprint(fn_node: ast.FunctionDef, file_path: str,
     Build a complete FunctionFingerprint from a (raw) function AST node.
 
     Orchestrates: normalize → extract all features → hash → assemble.
+    Functions whose AST shape was already fingerprinted reuse that result
+    (see _shape_cache and _node_cores) and skip straight to assembly.
 
     Args:
         fn_node:   The FunctionDef AST node.
@@ -452,15 +824,49 @@ def build_fingerprint(fn_node: ast.FunctionDef, file_path: str,
     Returns:
         A fully populated FunctionFingerprint.
     """
+    with _shape_cache_lock:
+        memo = _node_cores.get(fn_node)
+    if memo is not None and memo[0] == is_public:
+        core = memo[1]
+    else:
+        key = (_shape_key(fn_node), is_public)
+        with _shape_cache_lock:
+            core = _shape_cache.get(key)
+            if core is not None:
+                _shape_cache.move_to_end(key)
+        if core is None:
+            core = _build_fingerprint_core(fn_node, is_public)
+            with _shape_cache_lock:
+                _shape_cache[key] = core
+                if len(_shape_cache) > _SHAPE_CACHE_SIZE:
+                    _shape_cache.popitem(last=False)
+        with _shape_cache_lock:
+            _node_cores[fn_node] = (is_public, core)
+
+    (signature, control_flow, conditions, calls, side_effects,
+     exceptions, returns, fp_hash) = core
+
+    return FunctionFingerprint(
+        stable_id=stable_id,
+        file_path=file_path,
+        signature=signature,
+        control_flow=control_flow,
+        conditions=conditions,
+        calls=calls,
+        side_effects=side_effects,
+        exceptions=exceptions,
+        returns=returns,
+        is_public=is_public,
+        fingerprint_hash=fp_hash,
+    )
+
+
+def _build_fingerprint_core(fn_node: ast.FunctionDef, is_public: bool) -> tuple:
+    """Normalize, extract every feature and hash; the shape-dependent part of build_fingerprint."""
     normalized = normalize_function_ast(fn_node)
 
-    signature = extract_signature_features(normalized)
-    control_flow = extract_control_flow_features(normalized)
-    conditions = extract_condition_features(normalized)
-    calls = extract_call_features(normalized)
-    side_effects = extract_side_effect_features(normalized)
-    exceptions = extract_exception_features(normalized)
-    returns = extract_return_features(normalized)
+    (signature, control_flow, conditions, calls, side_effects,
+     exceptions, returns) = extract_all_features(normalized)
 
     # Build a dict of all features for hashing
     features_dict = {
@@ -505,16 +911,5 @@ def build_fingerprint(fn_node: ast.FunctionDef, file_path: str,
 
     fp_hash = stable_hash(features_dict)
 
-    return FunctionFingerprint(
-        stable_id=stable_id,
-        file_path=file_path,
-        signature=signature,
-        control_flow=control_flow,
-        conditions=conditions,
-        calls=calls,
-        side_effects=side_effects,
-        exceptions=exceptions,
-        returns=returns,
-        is_public=is_public,
-        fingerprint_hash=fp_hash,
-    )
+    return (signature, control_flow, conditions, calls, side_effects,
+            exceptions, returns, fp_hash)
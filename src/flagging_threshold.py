@@ -1,6 +1,7 @@
+import sys
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import AbstractSet, Optional
 
 
 # --- Enums ---
@@ -78,8 +79,18 @@ SEVERITY_MAP: dict[FlagReason, Severity] = {
 }
 
 
+# Order flags are reported in: HIGH first, then MEDIUM, then LOW
+SEVERITY_ORDER: tuple[Severity, ...] = (Severity.HIGH, Severity.MEDIUM, Severity.LOW)
+
+
 # --- Helper ---
 
+# Message prefix for each flag reason, e.g. "[signature_changed]"
+_REASON_PREFIX: dict[FlagReason, str] = {
+    reason: sys.intern(f"[{reason.value}]") for reason in FlagReason
+}
+
+
 # Builds a standardized human-readable message for a flag
 def _make_message(
     reason: FlagReason,
@@ -88,8 +99,20 @@ def _make_message(
     extra: str = "",
 ) -> str:
     doc_info = f" (referenced in '{doc.file_path}')" if doc else ""
-    base = f"[{reason.value}] '{element.name}' in '{element.file_path}'{doc_info}"
-    return f"{base}. {extra}".strip()
+    base = f"{_REASON_PREFIX[reason]} '{element.name}' in '{element.file_path}'{doc_info}"
+    if not extra:
+        return f"{base}."
+    return f"{base}. {extra}".rstrip()
+
+
+# Sorts flags in place by severity (see SEVERITY_ORDER), keeping the
+# existing order within each level. With only three levels this is a
+# single bucketing pass instead of a comparison sort.
+def sort_flags_by_severity(flags: list[Flag]) -> None:
+    buckets: dict[Severity, list[Flag]] = {severity: [] for severity in SEVERITY_ORDER}
+    for flag in flags:
+        buckets[flag.severity].append(flag)
+    flags[:] = [flag for severity in SEVERITY_ORDER for flag in buckets[severity]]
 
 
 # --- Check Functions ---
@@ -111,7 +134,7 @@ def check_signature_change(
     return None
 
 
-# Checks if parameters were added or removed between old and new versions
+# Checks if parameters were added, removed or renamed between old and new versions
 # Escalates severity to HIGH if 3 or more parameters changed at once
 def check_parameter_changes(
     old: CodeElement, new: CodeElement, doc: Optional[DocReference]
@@ -122,6 +145,28 @@ def check_parameter_changes(
     added = new_params - old_params
     removed = old_params - new_params
 
+    # Exactly one parameter swapped for another is reported as a rename,
+    # not as an unrelated addition plus removal
+    if len(added) == 1 and len(removed) == 1:
+        (old_name,), (new_name,) = removed, added
+        reason = FlagReason.PARAMETER_RENAMED
+        flags.append(
+            Flag(
+                reason=reason,
+                severity=SEVERITY_MAP[reason],
+                code_element=new,
+                doc_reference=doc,
+                message=_make_message(
+                    reason,
+                    new,
+                    doc,
+                    f"Parameter '{old_name}' renamed to '{new_name}'.",
+                ),
+                suggestion=f"Replace '{old_name}' with '{new_name}' in documentation.",
+            )
+        )
+        return flags
+
     # Escalate to HIGH if total param changes meet or exceed threshold
     escalate = (len(added) + len(removed)) >= PARAM_CHANGE_HIGH_THRESHOLD
 
@@ -240,7 +285,7 @@ def check_stale_doc(element: CodeElement, doc: DocReference) -> Optional[Flag]:
 
 # Checks if a symbol referenced in markdown docs no longer exists in the codebase
 def check_broken_markdown_ref(
-    symbol_name: str, all_current_symbols: set[str], doc: DocReference
+    symbol_name: str, all_current_symbols: AbstractSet[str], doc: DocReference
 ) -> Optional[Flag]:
     if symbol_name not in all_current_symbols:
         # Create a placeholder element to represent the deleted symbol
@@ -278,12 +323,15 @@ def run_flagging(
     doc_references: list[DocReference],
 ) -> list[Flag]:
     flags: list[Flag] = []
-    current_symbols = set(new_elements.keys())
 
-    # Build a lookup table from symbol name to its doc reference
-    doc_lookup: dict[str, DocReference] = {
-        ref.referenced_symbol: ref for ref in doc_references
-    }
+    # Build a lookup table from symbol name to its doc reference, noting
+    # references to symbols that no longer exist in the same pass
+    doc_lookup: dict[str, DocReference] = {}
+    broken_refs: list[DocReference] = []
+    for ref in doc_references:
+        doc_lookup[ref.referenced_symbol] = ref
+        if ref.referenced_symbol not in new_elements:
+            broken_refs.append(ref)
 
     # Check all elements that existed before for changes or removal
     for name, old_elem in old_elements.items():
@@ -296,6 +344,19 @@ def run_flagging(
 
         new_elem = new_elements[name]
 
+        # Unchanged element: the signature, parameter and return type checks
+        # cannot fire, so only the linked doc needs checking
+        if (
+            old_elem.hash == new_elem.hash
+            and old_elem.params == new_elem.params
+            and old_elem.return_type == new_elem.return_type
+        ):
+            if doc:
+                stale_flag = check_stale_doc(new_elem, doc)
+                if stale_flag:
+                    flags.append(stale_flag)
+            continue
+
         # Check for signature, parameter, and return type changes
         sig_flag = check_signature_change(old_elem, new_elem, doc)
         if sig_flag:
@@ -320,15 +381,12 @@ def run_flagging(
             if missing_flag:
                 flags.append(missing_flag)
 
-    # Check all doc references for broken markdown links
-    for doc in doc_references:
-        broken_flag = check_broken_markdown_ref(
-            doc.referenced_symbol, current_symbols, doc
-        )
-        if broken_flag:
-            flags.append(broken_flag)
+    # Flag broken markdown links (found while building doc_lookup); they
+    # still go after the element flags, as before
+    current_symbols = new_elements.keys()
+    for doc in broken_refs:
+        flags.append(check_broken_markdown_ref(doc.referenced_symbol, current_symbols, doc))
 
     # Sort flags by severity: HIGH first, then MEDIUM, then LOW
-    order = {Severity.HIGH: 0, Severity.MEDIUM: 1, Severity.LOW: 2}
-    flags.sort(key=lambda f: order[f.severity])
+    sort_flags_by_severity(flags)
     return flags 
\ No newline at end of file
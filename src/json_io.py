@@ -0,0 +1,77 @@
+"""
+JSON I/O — JSON encoding/decoding for the pipeline's files.
+
+The baseline (.docrot-fingerprints.json) and report (.docrot-report.json)
+are the largest files a run writes. When the optional `orjson` package is
+installed they are encoded with it (C implementation, produces bytes
+directly); otherwise the stdlib json module is used. Both produce
+2-space-indented JSON with non-ASCII text written as raw UTF-8 (not
+ASCII-escaped), so for the data the pipeline writes (strings, ints, bools,
+null; no floats) the bytes are the same whichever encoder ran. Floats
+would parse back equal but can be spelled differently (1e-07 vs 1e-7).
+
+dumps_compact() is the whitespace-free variant for internal caches.
+read_json() is the matching reader: it parses a file's raw bytes with
+orjson when available, and raises json.JSONDecodeError on bad input
+either way (orjson's error type subclasses it).
+"""
+
+import json
+from typing import Any
+
+try:  # Optional accelerator; stdlib json is the fallback.
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_pretty(data: Any, sort_keys: bool = False) -> bytes:
+    """
+    Encode `data` as 2-space-indented UTF-8 JSON (non-ASCII unescaped).
+
+    Args:
+        data:      JSON-serializable object.
+        sort_keys: Emit object keys in sorted order.
+
+    Returns:
+        The encoded document as bytes.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            pass  # e.g. non-str keys or >64-bit ints; stdlib handles those
+    return json.dumps(
+        data, indent=2, sort_keys=sort_keys, ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def dumps_compact(data: Any) -> bytes:
+    """
+    Encode `data` as UTF-8 JSON without any whitespace, for files that are
+    only ever read back by the tool (e.g. the parse cache).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass  # e.g. non-str keys or >64-bit ints; stdlib handles those
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def read_json(path: str) -> Any:
+    """
+    Read and parse a UTF-8 JSON file.
+
+    Raises:
+        OSError:              The file cannot be read.
+        json.JSONDecodeError: The content is not valid JSON.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -5,15 +5,15 @@ Contains dataclasses representing fingerprints, semantic deltas,
 change events, and doc alerts used throughout the pipeline.
 """
 
-from dataclasses import dataclass, field, asdict
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
 
 
 # ---------------------------------------------------------------------------
 # Semantic Fingerprint — captures the "meaning" of a single function/method
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class SignatureFeatures:
     """Function signature details (name, params, defaults, return annotation)."""
     name: str = ""
@@ -22,7 +22,7 @@ class SignatureFeatures:
     return_annotation: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ControlFlowFeatures:
     """Shape of if/elif/else, loops, early returns."""
     if_count: int = 0
@@ -33,20 +33,20 @@ class ControlFlowFeatures:
     early_return_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ConditionFeatures:
     """Operators and comparisons used in branching."""
     comparison_ops: List[str] = field(default_factory=list)   # e.g. ["Gt", "Eq"]
     boolean_ops: List[str] = field(default_factory=list)      # e.g. ["And", "Or"]
 
 
-@dataclass
+@dataclass(slots=True)
 class CallFeatures:
     """External / notable function/method calls."""
     call_names: List[str] = field(default_factory=list)       # e.g. ["db.query", "requests.get"]
 
 
-@dataclass
+@dataclass(slots=True)
 class SideEffectFeatures:
     """Signals for DB/file/network/auth writes."""
     db_calls: List[str] = field(default_factory=list)
@@ -55,7 +55,7 @@ class SideEffectFeatures:
     auth_calls: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExceptionFeatures:
     """Raised / caught / propagated exceptions."""
     raises: List[str] = field(default_factory=list)
@@ -63,14 +63,14 @@ class ExceptionFeatures:
     has_bare_except: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnFeatures:
     """Return expressions and branch outcomes."""
     return_count: int = 0
     returns_none: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionFingerprint:
     """Complete semantic fingerprint for one function/method."""
     stable_id: str = ""                         # unique ID: "file::class.method" or "file::func"
@@ -86,8 +86,25 @@ class FunctionFingerprint:
     fingerprint_hash: str = ""                  # deterministic hash of all features
 
     def to_dict(self) -> Dict[str, Any]:
-        """Serialize to a plain dict for JSON persistence."""
-        return asdict(self)
+        """
+        Serialize to a plain dict for JSON persistence.
+
+        Same result as dataclasses.asdict() (lists are copied, since
+        feature objects can be shared between fingerprints), built from
+        precomputed field names instead of asdict's generic deep copy.
+        """
+        data: Dict[str, Any] = {}
+        for name in _FINGERPRINT_FIELDS:
+            value = getattr(self, name)
+            feature_fields = _FEATURE_FIELDS.get(name)
+            if feature_fields is not None:
+                features = value
+                value = {}
+                for key in feature_fields:
+                    item = getattr(features, key)
+                    value[key] = list(item) if type(item) is list else item
+            data[name] = value
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "FunctionFingerprint":
@@ -107,11 +124,21 @@ class FunctionFingerprint:
         )
 
 
+# Field names for FunctionFingerprint.to_dict(), resolved once: the
+# fingerprint's own fields, and for each nested feature field its class's.
+_FINGERPRINT_FIELDS = tuple(f.name for f in fields(FunctionFingerprint))
+_FEATURE_FIELDS = {
+    f.name: tuple(sub.name for sub in fields(f.type))
+    for f in fields(FunctionFingerprint)
+    if isinstance(f.type, type) and hasattr(f.type, "__dataclass_fields__")
+}
+
+
 # ---------------------------------------------------------------------------
 # Semantic Delta — diff between old and new fingerprints of one function
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class SemanticDelta:
     """Result of comparing two FunctionFingerprints."""
     only_comment_or_formatting_changes: bool = False
@@ -127,12 +154,24 @@ class SemanticDelta:
     exception_behavior_changed: bool = False
     core_control_path_added_or_removed: bool = False
 
+    def to_mask(self) -> int:
+        """Pack the flags into an int: bit i is the i-th field above."""
+        mask = 0
+        for bit, name in enumerate(SEMANTIC_DELTA_FLAGS):
+            if getattr(self, name):
+                mask |= 1 << bit
+        return mask
+
+
+# SemanticDelta flag names in bit order (see SemanticDelta.to_mask).
+SEMANTIC_DELTA_FLAGS = tuple(f.name for f in fields(SemanticDelta))
+
 
 # ---------------------------------------------------------------------------
 # Change Event — one per function that changed, emitted by the comparator
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class ChangeEvent:
     """A scored change event for a single function."""
     function_id: str = ""
@@ -140,7 +179,7 @@ class ChangeEvent:
     event_type: str = ""          # "function_added" | "function_removed" | "semantic_change"
     score: int = 0
     critical: bool = False
-    reasons: List[str] = field(default_factory=list)
+    reasons: Tuple[str, ...] = ()  # shared between events — never mutate
 
 
 # ---------------------------------------------------------------------------
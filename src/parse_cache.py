@@ -0,0 +1,250 @@
+"""
+Parse Cache — Content-addressed cache of per-file fingerprints.
+
+Most files are unchanged between two runs, yet every run re-parses and
+re-fingerprints the whole repository. This cache remembers, for each
+file, a digest of its source text together with the fingerprints that
+source produced. When the digest still matches, the whole
+parse → walk → build_fingerprint pipeline for that file is skipped.
+
+Entries also keep a hash of each function's source text. When a file
+did change, its functions whose text did not are re-used from the previous
+entry instead of being fingerprinted again (see ParseCache.prior). These
+hashes belong to this cache only; they are never written to the baseline.
+
+Each entry also records the file's stat signature (mtime_ns, size,
+inode). A file whose signature still matches is served without even
+being read and hashed; any signature change falls back to the digest
+check, so a touched-but-identical file is still a hit.
+
+The cache is a JSON file kept out of the worktree: inside the repository's
+git directory (.git/docrot-parsecache.json), so it is never shown as an
+untracked file, committed by accident, or removed by `git clean`. Only a
+directory that is not a git checkout gets a .docrot-parsecache.json at its
+root. It is purely an accelerator: deleting it, or any
+read/write failure, only costs a full re-scan and never changes results.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.json_io import dumps_compact, read_json
+from src.models import FunctionFingerprint
+from src.persistence import deserialize_file_fingerprints
+
+try:  # Optional accelerator; hashlib.blake2b is the stdlib fallback.
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+PARSE_CACHE_FILENAME = ".docrot-parsecache.json"
+GIT_PARSE_CACHE_FILENAME = "docrot-parsecache.json"
+
+# Bump when the fingerprint format changes in a way the source digest
+# cannot see (e.g. new features extracted from the same source).
+CACHE_VERSION = 1
+
+# Source files whose contents decide what a fingerprint looks like. Their
+# digest is part of the cache version, so editing the extractor invalidates
+# every entry without anyone having to remember to bump CACHE_VERSION.
+_FINGERPRINT_MODULES = ("ast_parser.py", "fingerprint.py", "models.py")
+
+
+# A file modified this close to the scan could change again within the
+# filesystem's timestamp granularity without its signature changing, so
+# its signature is not trusted (same idea as git's "racy" index entries).
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def file_signature(abs_path: str) -> Optional[List[int]]:
+    """Return [mtime_ns, size, inode] for a file, or None if stat fails."""
+    try:
+        st = os.stat(abs_path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def source_digest(source_code: str) -> str:
+    """Return a hex digest of a source string (BLAKE3 if available)."""
+    data = source_code.encode("utf-8")
+    if blake3 is not None:
+        return blake3.blake3(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+def parse_cache_path(repo_path: str) -> str:
+    """
+    Return where the parse cache for `repo_path` lives: inside its git
+    directory when it has one (a .git directory, or a .git file pointing
+    at one, as in worktrees and submodules), else at the repo root.
+    """
+    git_path = os.path.join(repo_path, ".git")
+    if os.path.isdir(git_path):
+        return os.path.join(git_path, GIT_PARSE_CACHE_FILENAME)
+    try:
+        with open(git_path, "r", encoding="utf-8") as f:
+            line = f.readline().strip()
+    except OSError:
+        line = ""
+    if line.startswith("gitdir:"):
+        git_dir = os.path.join(repo_path, line[len("gitdir:"):].strip())
+        if os.path.isdir(git_dir):
+            return os.path.join(git_dir, GIT_PARSE_CACHE_FILENAME)
+    return os.path.join(repo_path, PARSE_CACHE_FILENAME)
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """Identify the fingerprinting code that produced a cached result."""
+    h = hashlib.blake2b(str(CACHE_VERSION).encode("ascii"), digest_size=16)
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _FINGERPRINT_MODULES:
+        try:
+            with open(os.path.join(here, name), "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(name.encode("utf-8"))
+    return h.hexdigest()
+
+
+class ParseCache:
+    """
+    Map of {file_path: (source digest, {stable_id: fingerprint_dict},
+    {stable_id: function source hash})}.
+
+    Entries are keyed by file path as well as content because the path is
+    baked into every stable ID. Only entries used during the current run
+    are written back by save(), so deleted or renamed files drop out of
+    the cache on their own.
+    """
+
+    def __init__(self, repo_path: str):
+        self.path = parse_cache_path(repo_path)
+        self._version = code_version()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._used: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = read_json(self.path)
+        except (json.JSONDecodeError, OSError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self._version:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, source_code: str, file_path: str) -> Optional[Dict[str, FunctionFingerprint]]:
+        """
+        Return cached fingerprints for this exact source at this path,
+        or None on a miss.
+        """
+        return self.lookup(source_digest(source_code), file_path)
+
+    def lookup(self, digest: str, file_path: str,
+               signature: Optional[List[int]] = None) -> Optional[Dict[str, FunctionFingerprint]]:
+        """
+        Like get(), for a caller that already has the source digest.
+        A `signature` (see file_signature) is recorded on a hit, so the
+        next run can use lookup_stat() for this file.
+        """
+        entry = self._entries.get(file_path)
+        if entry is None or entry.get("digest") != digest:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry["stat"] = _trusted(signature)
+        self._used[file_path] = entry
+        return deserialize_file_fingerprints(entry.get("functions", {}))
+
+    def prior(self, file_path: str) -> Optional[Dict[str, Tuple[str, FunctionFingerprint]]]:
+        """
+        Return {stable_id: (source_hash, fingerprint)} from the entry last
+        cached for `file_path`, whatever its digest, or None if there is
+        none. Used to re-use unchanged functions of a changed file.
+        """
+        entry = self._entries.get(file_path)
+        if entry is None:
+            return None
+        sources = entry.get("sources") or {}
+        fps = deserialize_file_fingerprints({
+            sid: fp for sid, fp in entry.get("functions", {}).items() if sid in sources
+        })
+        return {sid: (sources[sid], fp) for sid, fp in fps.items()}
+
+    def recorded_digest(self, file_path: str) -> Optional[str]:
+        """Return the source digest cached for `file_path`, or None."""
+        entry = self._entries.get(file_path)
+        return None if entry is None else entry.get("digest")
+
+    def lookup_stat(self, file_path: str,
+                    signature: Optional[List[int]]) -> Optional[Dict[str, FunctionFingerprint]]:
+        """
+        Return cached fingerprints if the file's stat signature is the one
+        recorded with them, without reading the file; None otherwise.
+        A None result is not counted as a miss, since the caller goes on
+        to the digest check.
+        """
+        entry = self._entries.get(file_path)
+        if signature is None or entry is None or entry.get("stat") != signature:
+            return None
+        self.hits += 1
+        self._used[file_path] = entry
+        return deserialize_file_fingerprints(entry.get("functions", {}))
+
+    def put(self, source_code: str, file_path: str,
+            fingerprints: Dict[str, FunctionFingerprint],
+            source_hashes: Optional[Dict[str, str]] = None) -> None:
+        """
+        Record the fingerprints computed for this source, with the
+        per-function source hashes they came from, if known.
+        """
+        self.store(source_digest(source_code), file_path, fingerprints,
+                   source_hashes=source_hashes)
+
+    def store(self, digest: str, file_path: str,
+              fingerprints: Dict[str, FunctionFingerprint],
+              signature: Optional[List[int]] = None,
+              source_hashes: Optional[Dict[str, str]] = None) -> None:
+        """
+        Like put(), for a caller that already has the source digest.
+        `signature` must be taken before the source was read.
+        """
+        entry = {
+            "digest": digest,
+            "stat": _trusted(signature),
+            "functions": {sid: fp.to_dict() for sid, fp in fingerprints.items()},
+            "sources": dict(source_hashes or {}),
+        }
+        self._entries[file_path] = entry
+        self._used[file_path] = entry
+
+    def save(self) -> None:
+        """Write the entries used this run back to disk (best-effort)."""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(dumps_compact({"version": self._version, "entries": self._used}))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[docrot] Warning: could not write parse cache: {e}")
+            try:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def _trusted(signature: Optional[List[int]]) -> Optional[List[int]]:
+    """Drop a signature whose mtime is too recent to rely on."""
+    if signature is None or signature[0] >= time.time_ns() - _RACY_WINDOW_NS:
+        return None
+    return signature
@@ -5,13 +5,19 @@ MVP uses a JSON file (.docrot-fingerprints.json) as the single source
 of truth for the "old" baseline. On each run we compare stored
 fingerprints against freshly-extracted ones from the current code.
 
-Post-MVP: migrate to SQLite for indexed queries and large-codebase support.
+An indexed SQLite baseline (src/persistence_sqlite.py) can be selected
+with `"storage": "sqlite"` in the config; the functions below take a
+`storage` argument and dispatch to it.
 """
 
 import json
 import os
-from typing import Any, Dict
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
 
+from src import persistence_sqlite
+from src.json_io import dumps_pretty, read_json
 from src.models import FunctionFingerprint
 
 
@@ -23,24 +29,30 @@ def _fingerprint_path(repo_path: str) -> str:
     return os.path.join(repo_path, FINGERPRINT_FILENAME)
 
 
-def load_fingerprints(repo_path: str) -> Dict[str, Dict[str, Any]]:
+def load_fingerprints(repo_path: str, storage: str = "json") -> Dict[str, Dict[str, Any]]:
     """
     Load previously stored fingerprints from the JSON file.
 
+    Each call parses the file afresh and returns a new dict, so callers
+    may modify it. run() loads the baseline once and reuses it for the
+    whole run.
+
     Args:
         repo_path: Root path of the repository.
+        storage:   "json" or "sqlite" (see config.get_storage_backend).
 
     Returns:
         Dict of {file_path: {stable_id: fingerprint_dict}}.
         Returns empty dict if the file does not exist (first run).
     """
-    fp_path = _fingerprint_path(repo_path)
-    if not os.path.exists(fp_path):
-        return {}
+    if storage == "sqlite":
+        return persistence_sqlite.load_fingerprints(repo_path)
 
+    fp_path = _fingerprint_path(repo_path)
     try:
-        with open(fp_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(fp_path)
+    except FileNotFoundError:
+        return {}
     except (json.JSONDecodeError, OSError) as e:
         print(f"[docrot] Warning: could not read fingerprints ({e}); treating as first run.")
         return {}
@@ -51,7 +63,34 @@ def load_fingerprints(repo_path: str) -> Dict[str, Dict[str, Any]]:
     return data
 
 
-def persist_fingerprints(repo_path: str, fingerprints: Dict[str, Dict[str, Any]]) -> None:
+def fingerprint_hashes(stored: Mapping) -> Dict[str, Dict[str, str]]:
+    """
+    Return {file_path: {stable_id: fingerprint_hash}} for a baseline from
+    load_fingerprints(). The SQLite backend answers this from an indexed
+    column, without decoding any stored fingerprint.
+    """
+    if isinstance(stored, persistence_sqlite.LazyFingerprints):
+        return stored.fingerprint_hashes()
+    return {
+        file_path: {
+            fn_id: fp_dict.get("fingerprint_hash", "")
+            for fn_id, fp_dict in functions.items()
+        }
+        for file_path, functions in stored.items()
+    }
+
+
+def close_fingerprints(stored: Mapping) -> None:
+    """Release a baseline from load_fingerprints() (closes SQLite handles)."""
+    if isinstance(stored, persistence_sqlite.LazyFingerprints):
+        stored.close()
+
+
+def persist_fingerprints(
+    repo_path: str,
+    fingerprints: Dict[str, Dict[str, Any]],
+    storage: str = "json",
+) -> None:
     """
     Write current fingerprints to the JSON file, replacing the old baseline.
 
@@ -61,12 +100,17 @@ def persist_fingerprints(repo_path: str, fingerprints: Dict[str, Dict[str, Any]]
     Args:
         repo_path:    Root path of the repository.
         fingerprints: Dict of {file_path: {stable_id: fingerprint_dict}}.
+        storage:      "json" or "sqlite".
     """
+    if storage == "sqlite":
+        persistence_sqlite.persist_fingerprints(repo_path, fingerprints)
+        return
+
     fp_path = _fingerprint_path(repo_path)
     tmp_path = f"{fp_path}.tmp"
     try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(fingerprints, f, indent=2, sort_keys=True)
+        with open(tmp_path, "wb") as f:
+            f.write(dumps_pretty(fingerprints, sort_keys=True))
         os.replace(tmp_path, fp_path)
     except OSError as e:
         print(f"[docrot] Error: could not write fingerprints: {e}")
@@ -77,7 +121,7 @@ def persist_fingerprints(repo_path: str, fingerprints: Dict[str, Dict[str, Any]]
             pass
 
 
-def is_first_run(repo_path: str) -> bool:
+def is_first_run(repo_path: str, storage: str = "json") -> bool:
     """
     Check whether prior fingerprints exist.
 
@@ -85,20 +129,19 @@ def is_first_run(repo_path: str) -> bool:
 
     Args:
         repo_path: Root path of the repository.
+        storage:   "json" or "sqlite".
 
     Returns:
         True if no fingerprint file exists or it is empty.
     """
-    fp_path = _fingerprint_path(repo_path)
-    if not os.path.exists(fp_path):
-        return True
+    if storage == "sqlite":
+        return persistence_sqlite.is_first_run(repo_path)
 
     try:
-        with open(fp_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return not bool(data)
+        data = read_json(_fingerprint_path(repo_path))
     except (json.JSONDecodeError, OSError):
         return True
+    return not bool(data)
 
 
 def serialize_file_fingerprints(
@@ -116,24 +159,91 @@ def serialize_file_fingerprints(
     return {sid: fp.to_dict() for sid, fp in fingerprints.items()}
 
 
+def intern_fingerprint_strings(fp: FunctionFingerprint) -> FunctionFingerprint:
+    """
+    Intern the highly repeated strings of a loaded fingerprint in place.
+
+    Call names, exception names, operator names and file paths repeat
+    across thousands of functions; json.load() gives every occurrence its
+    own str object. Interning makes them share one object each, which
+    shrinks the loaded baseline and lets equality checks in the comparator
+    hit the identity fast path.
+
+    Args:
+        fp: A freshly deserialized FunctionFingerprint.
+
+    Returns:
+        The same FunctionFingerprint, for chaining.
+    """
+    intern = sys.intern
+    fp.file_path = intern(fp.file_path)
+    fp.signature.params = [intern(p) for p in fp.signature.params]
+    fp.conditions.comparison_ops = [intern(op) for op in fp.conditions.comparison_ops]
+    fp.conditions.boolean_ops = [intern(op) for op in fp.conditions.boolean_ops]
+    fp.calls.call_names = [intern(c) for c in fp.calls.call_names]
+    side_effects = fp.side_effects
+    side_effects.db_calls = [intern(c) for c in side_effects.db_calls]
+    side_effects.file_calls = [intern(c) for c in side_effects.file_calls]
+    side_effects.network_calls = [intern(c) for c in side_effects.network_calls]
+    side_effects.auth_calls = [intern(c) for c in side_effects.auth_calls]
+    fp.exceptions.raises = [intern(r) for r in fp.exceptions.raises]
+    fp.exceptions.except_handlers = [intern(h) for h in fp.exceptions.except_handlers]
+    return fp
+
+
 def deserialize_file_fingerprints(
     data: Dict[str, Any],
 ) -> Dict[str, FunctionFingerprint]:
     """
     Convert a dict of {stable_id: plain_dict} back to FunctionFingerprint objects.
 
+    Repeated strings are interned (see intern_fingerprint_strings).
+
     Args:
         data: Dict mapping stable IDs to plain dicts (from JSON).
 
     Returns:
         Dict mapping stable IDs to FunctionFingerprint objects.
     """
-    return {sid: FunctionFingerprint.from_dict(fp_dict) for sid, fp_dict in data.items()}
+    return {
+        sys.intern(sid): intern_fingerprint_strings(FunctionFingerprint.from_dict(fp_dict))
+        for sid, fp_dict in data.items()
+    }
+
+
+class DeserializedFingerprints(Mapping):
+    """
+    Read-only {file_path: {stable_id: FunctionFingerprint}} view over a
+    baseline from load_fingerprints(). A file is deserialized (and, for
+    the SQLite backend, fetched) only when it is first accessed.
+    """
+
+    def __init__(self, stored: Mapping):
+        self._stored = stored
+        self._files: Dict[str, Dict[str, FunctionFingerprint]] = {}
+
+    def __getitem__(self, file_path: str) -> Dict[str, FunctionFingerprint]:
+        fps = self._files.get(file_path)
+        if fps is None:
+            fps = deserialize_file_fingerprints(self._stored[file_path])
+            self._files[file_path] = fps
+        return fps
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._stored)
+
+    def __len__(self) -> int:
+        return len(self._stored)
+
+    def __contains__(self, file_path: object) -> bool:
+        return file_path in self._stored
 
 
 def update_fingerprint_baseline(
     repo_path: str,
     current_fingerprints: Dict[str, Dict[str, Any]],
+    storage: str = "json",
+    old_hashes: Optional[Dict[str, Dict[str, str]]] = None,
 ) -> Dict[str, int]:
     """
     Update the fingerprint baseline and return a detailed change summary.
@@ -145,6 +255,9 @@ def update_fingerprint_baseline(
         repo_path: Root path of the repository.
         current_fingerprints: Current scan as
             {file_path: {stable_id: fingerprint_dict}}.
+        storage: "json" or "sqlite".
+        old_hashes: fingerprint_hashes() of the stored baseline, if the
+            caller already has them; otherwise the baseline is loaded.
 
     Returns:
         Dict containing summary counters:
@@ -159,7 +272,12 @@ def update_fingerprint_baseline(
           - total_files
           - total_functions
     """
-    old_fingerprints = load_fingerprints(repo_path)
+    if old_hashes is None:
+        stored = load_fingerprints(repo_path, storage)
+        try:
+            old_hashes = fingerprint_hashes(stored)
+        finally:
+            close_fingerprints(stored)
 
     stats: Dict[str, int] = {
         "files_added": 0,
@@ -174,44 +292,41 @@ def update_fingerprint_baseline(
         "total_functions": sum(len(v) for v in current_fingerprints.values()),
     }
 
-    old_files = set(old_fingerprints.keys())
-    new_files = set(current_fingerprints.keys())
+    # dict key views support set algebra directly.
+    old_files = old_hashes.keys()
+    new_files = current_fingerprints.keys()
 
     stats["files_added"] = len(new_files - old_files)
     stats["files_removed"] = len(old_files - new_files)
 
-    for file_path in sorted(new_files):
-        old_funcs = old_fingerprints.get(file_path, {})
-        new_funcs = current_fingerprints.get(file_path, {})
-
-        old_ids = set(old_funcs.keys())
-        new_ids = set(new_funcs.keys())
-
-        added_ids = new_ids - old_ids
-        removed_ids = old_ids - new_ids
-        common_ids = old_ids & new_ids
-
-        stats["functions_added"] += len(added_ids)
-        stats["functions_removed"] += len(removed_ids)
-
-        changed_in_file = False
-        if added_ids or removed_ids:
-            changed_in_file = True
-
-        for fn_id in common_ids:
-            old_hash = old_funcs.get(fn_id, {}).get("fingerprint_hash", "")
-            new_hash = new_funcs.get(fn_id, {}).get("fingerprint_hash", "")
-            if old_hash == new_hash:
-                stats["functions_unchanged"] += 1
-            else:
-                stats["functions_changed"] += 1
-                changed_in_file = True
-
-        if file_path in old_files:
-            if changed_in_file:
-                stats["files_changed"] += 1
-            else:
-                stats["files_unchanged"] += 1
-
-    persist_fingerprints(repo_path, current_fingerprints)
+    # Flatten both sides (restricted to the current files, as functions of
+    # removed files are not counted) into (file, id, hash) triples; every
+    # function count then falls out of C-level set operations.
+    old_triples = {
+        (file_path, fn_id, fp_hash)
+        for file_path in new_files & old_files
+        for fn_id, fp_hash in old_hashes[file_path].items()
+    }
+    new_triples = {
+        (file_path, fn_id, fp_dict.get("fingerprint_hash", ""))
+        for file_path, functions in current_fingerprints.items()
+        for fn_id, fp_dict in functions.items()
+    }
+    old_ids = {(file_path, fn_id) for file_path, fn_id, _ in old_triples}
+    new_ids = {(file_path, fn_id) for file_path, fn_id, _ in new_triples}
+    common = len(old_ids & new_ids)
+    unchanged = len(old_triples & new_triples)
+
+    stats["functions_added"] = len(new_ids - old_ids)
+    stats["functions_removed"] = len(old_ids - new_ids)
+    stats["functions_unchanged"] = unchanged
+    stats["functions_changed"] = common - unchanged
+
+    # A triple on only one side is an added, removed or modified function.
+    dirty_files = {file_path for file_path, _, _ in old_triples ^ new_triples}
+    kept_files = new_files & old_files
+    stats["files_changed"] = len(kept_files & dirty_files)
+    stats["files_unchanged"] = len(kept_files - dirty_files)
+
+    persist_fingerprints(repo_path, current_fingerprints, storage)
     return stats
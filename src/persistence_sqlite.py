@@ -0,0 +1,231 @@
+"""
+Persistence (SQLite) — Indexed fingerprint baseline storage.
+
+Opt-in alternative to the JSON baseline, selected with
+`"storage": "sqlite"` in .docrot-config.json. Each function is one row
+keyed by (file_path, function_id), so reading one file's fingerprints is
+an indexed lookup instead of parsing the whole baseline.
+
+The data shape seen by callers is unchanged: load_fingerprints() returns a
+read-only mapping of {file_path: {stable_id: fingerprint_dict}} that
+queries a file's rows only when that file is accessed. Each function's
+fingerprint_hash is also kept in its own column, so
+LazyFingerprints.fingerprint_hashes() can tell which files changed without
+decoding any fingerprint. The mapping owns a database connection: close()
+it (or use it as a context manager) when done.
+
+Writes are incremental: each file's rows are stored with a digest of
+their serialized content, and persist_fingerprints() only rewrites the
+files whose digest changed (and drops files that disappeared), so the
+write cost follows the number of changed files, not the baseline size.
+
+The GitHub Action exchanges the JSON baseline with the backend, so this
+backend is meant for local runs.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+
+FINGERPRINT_DB_FILENAME = ".docrot-fingerprints.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    file_path        TEXT NOT NULL,
+    function_id      TEXT NOT NULL,
+    fingerprint_hash TEXT,
+    features_blob    TEXT NOT NULL,
+    PRIMARY KEY (file_path, function_id)
+);
+CREATE TABLE IF NOT EXISTS files (
+    file_path    TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL
+);
+"""
+
+
+def _db_path(repo_path: str) -> str:
+    """Return the full path to the fingerprint database."""
+    return os.path.join(repo_path, FINGERPRINT_DB_FILENAME)
+
+
+def _connect(repo_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(_db_path(repo_path))
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+class LazyFingerprints(Mapping):
+    """
+    Read-only {file_path: {stable_id: fingerprint_dict}} view over the
+    database. A file's rows are fetched (and memoized) on first access.
+    Holds the connection until close() (or the end of a `with` block).
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._files: Dict[str, Dict[str, Any]] = {}
+
+    def __getitem__(self, file_path: str) -> Dict[str, Any]:
+        cached = self._files.get(file_path)
+        if cached is not None:
+            return cached
+        rows = self._conn.execute(
+            "SELECT function_id, features_blob FROM fingerprints WHERE file_path = ?",
+            (file_path,),
+        ).fetchall()
+        if not rows:
+            raise KeyError(file_path)
+        functions = {fn_id: json.loads(blob) for fn_id, blob in rows}
+        self._files[file_path] = functions
+        return functions
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._conn.execute(
+            "SELECT DISTINCT file_path FROM fingerprints ORDER BY file_path"
+        )
+        return (file_path for (file_path,) in rows.fetchall())
+
+    def __len__(self) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(DISTINCT file_path) FROM fingerprints"
+        ).fetchone()[0]
+
+    def __contains__(self, file_path: object) -> bool:
+        if file_path in self._files:
+            return True
+        return self._conn.execute(
+            "SELECT 1 FROM fingerprints WHERE file_path = ? LIMIT 1", (file_path,)
+        ).fetchone() is not None
+
+    def fingerprint_hashes(self) -> Dict[str, Dict[str, str]]:
+        """
+        Return {file_path: {stable_id: fingerprint_hash}} for the whole
+        baseline from the indexed column, without decoding any blob.
+        """
+        hashes: Dict[str, Dict[str, str]] = {}
+        rows = self._conn.execute(
+            "SELECT file_path, function_id, fingerprint_hash FROM fingerprints"
+        )
+        for file_path, fn_id, fp_hash in rows:
+            hashes.setdefault(file_path, {})[fn_id] = fp_hash or ""
+        return hashes
+
+    def close(self) -> None:
+        """Close the underlying connection; the mapping is unusable afterwards."""
+        self._conn.close()
+
+    def __enter__(self) -> "LazyFingerprints":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def load_fingerprints(repo_path: str) -> Mapping:
+    """
+    Open the stored baseline as a lazy mapping.
+
+    Args:
+        repo_path: Root path of the repository.
+
+    Returns:
+        A LazyFingerprints mapping of {file_path: {stable_id:
+        fingerprint_dict}} (close it when done), or an empty dict if the
+        database does not exist (first run) or cannot be opened.
+    """
+    if not os.path.exists(_db_path(repo_path)):
+        return {}
+    try:
+        return LazyFingerprints(_connect(repo_path))
+    except sqlite3.Error as e:
+        print(f"[docrot] Warning: could not read fingerprints ({e}); treating as first run.")
+        return {}
+
+
+def persist_fingerprints(repo_path: str, fingerprints: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Make the stored baseline equal to `fingerprints` in one transaction.
+
+    Only files whose serialized fingerprints differ from what is stored
+    are rewritten; files missing from `fingerprints` are deleted.
+
+    Args:
+        repo_path:    Root path of the repository.
+        fingerprints: Dict of {file_path: {stable_id: fingerprint_dict}}.
+    """
+    try:
+        conn = _connect(repo_path)
+        try:
+            stored = dict(conn.execute("SELECT file_path, content_hash FROM files"))
+            # Taken from the rows themselves, so databases written before
+            # the files table existed are cleaned up too.
+            stored_files = {
+                file_path
+                for (file_path,) in conn.execute("SELECT DISTINCT file_path FROM fingerprints")
+            }
+            with conn:
+                for file_path in (stored_files | stored.keys()) - fingerprints.keys():
+                    conn.execute("DELETE FROM fingerprints WHERE file_path = ?", (file_path,))
+                    conn.execute("DELETE FROM files WHERE file_path = ?", (file_path,))
+                for file_path, functions in fingerprints.items():
+                    blobs = {
+                        fn_id: json.dumps(fp_dict, sort_keys=True)
+                        for fn_id, fp_dict in functions.items()
+                    }
+                    content_hash = _content_hash(blobs)
+                    if stored.get(file_path) == content_hash:
+                        continue
+                    conn.execute("DELETE FROM fingerprints WHERE file_path = ?", (file_path,))
+                    # Columns are named: databases created before source_hash
+                    # was dropped from the schema still carry it (as NULL).
+                    conn.executemany(
+                        "INSERT INTO fingerprints"
+                        " (file_path, function_id, fingerprint_hash, features_blob)"
+                        " VALUES (?, ?, ?, ?)",
+                        [
+                            (
+                                file_path,
+                                fn_id,
+                                functions[fn_id].get("fingerprint_hash", ""),
+                                blob,
+                            )
+                            for fn_id, blob in blobs.items()
+                        ],
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?)", (file_path, content_hash)
+                    )
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[docrot] Error: could not write fingerprints: {e}")
+
+
+def _content_hash(blobs: Dict[str, str]) -> str:
+    """Digest of one file's {function_id: serialized fingerprint}."""
+    h = hashlib.blake2b(digest_size=16)
+    for fn_id in sorted(blobs):
+        h.update(fn_id.encode("utf-8"))
+        h.update(b"\0")
+        h.update(blobs[fn_id].encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def is_first_run(repo_path: str) -> bool:
+    """Return True if the database is missing or holds no fingerprints."""
+    if not os.path.exists(_db_path(repo_path)):
+        return True
+    try:
+        conn = _connect(repo_path)
+        try:
+            return conn.execute("SELECT 1 FROM fingerprints LIMIT 1").fetchone() is None
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return True
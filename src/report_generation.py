@@ -1,9 +1,9 @@
-import json
 import os
 from datetime import datetime
 from typing import Optional
 
 from src.flagging_threshold import Flag, Severity, FlagReason
+from src.json_io import dumps_pretty
 from src.models import AISuggestion
 
 
@@ -111,8 +111,8 @@ def generate_json_report(
     if report.ai_context:
         data["ai_context"] = report.ai_context
 
-    with open(output_path, "w", encoding="utf-8") as fh:
-        json.dump(data, fh, indent=2)
+    with open(output_path, "wb") as fh:
+        fh.write(dumps_pretty(data))
     return output_path
 
 
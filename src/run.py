@@ -21,25 +21,38 @@ import os
 import sys
 import time
 import argparse
-from typing import Dict, List, Optional
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Mapping, Optional, Tuple
 
 # FIX: All files are in the same flat directory — no 'src.' prefix needed.
 from src.ast_parser import extract_function_fingerprints
-from src.comparator import compare_file_functions
+from src.parse_cache import ParseCache, file_signature, source_digest
+from src.comparator import iter_file_function_changes
 from src.alerts import (
     evaluate_doc_flags,
     publish_alerts_to_log,
     publish_alerts_to_report,
     publish_baseline_notice,
 )
-from src.config import load_config, get_doc_mappings, get_thresholds, get_ai_config, is_ai_disabled
+from src.config import (
+    load_config,
+    get_doc_mappings,
+    get_thresholds,
+    get_ai_config,
+    get_storage_backend,
+    is_ai_disabled,
+)
 from src.models import AISuggestion, ChangeEvent, DocAlert, FunctionFingerprint
 from src.persistence import (
-    is_first_run,
+    DeserializedFingerprints,
+    close_fingerprints,
+    fingerprint_hashes,
     load_fingerprints,
     persist_fingerprints,
     serialize_file_fingerprints,
-    deserialize_file_fingerprints,
     update_fingerprint_baseline,
 )
 
@@ -50,6 +63,7 @@ from src.flagging_threshold import (
     FlagReason,
     Severity,
     run_flagging,
+    sort_flags_by_severity,
 )
 from src.report_generation import generate_reports
 from src.ai_suggestions import generate_ai_suggestions, build_ai_context
@@ -73,7 +87,9 @@ def _collect_python_files(repo_path: str) -> List[str]:
         for filename in files:
             if filename.endswith(".py"):
                 abs_path = os.path.join(root, filename)
-                rel_path = os.path.relpath(abs_path, repo_path).replace("\\", "/")
+                rel_path = os.path.relpath(abs_path, repo_path)
+                if os.sep != "/":
+                    rel_path = rel_path.replace(os.sep, "/")
                 py_files.append(rel_path)
     return sorted(py_files)
 
@@ -89,24 +105,143 @@ def _read_source(repo_path: str, rel_path: str) -> Optional[str]:
         return None
 
 
+# Below this many files to (re)fingerprint, worker start-up and pickling
+# cost more than they save, so the scan stays in-process.
+_PARALLEL_MIN_FILES = 32
+
+
+def _pool_context():
+    """
+    Start method for scan workers. Never fork: the parent may hold locks
+    (stdout, logging) that a forked child would inherit held.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _fingerprint_file(
+    repo_path: str,
+    rel_path: str,
+    prior: Optional[Dict[str, Tuple[str, FunctionFingerprint]]] = None,
+    cached_digest: Optional[str] = None,
+) -> Optional[Tuple[str, Optional[Dict[str, FunctionFingerprint]], Optional[Dict[str, str]]]]:
+    """
+    Read and fingerprint one file, returning (source digest, fingerprints,
+    per-function source hashes), or None if it cannot be read. If the
+    digest equals `cached_digest` (the parse cache's entry for this file),
+    fingerprinting is skipped and (digest, None, None) is returned. The
+    file is read once, and the source text lives only for the duration of
+    this call.
+    """
+    source = _read_source(repo_path, rel_path)
+    if source is None:
+        return None
+    digest = source_digest(source)
+    if digest == cached_digest:
+        return digest, None, None
+    source_hashes: Dict[str, str] = {}
+    fps = extract_function_fingerprints(source, rel_path, None, prior, source_hashes)
+    return digest, fps, source_hashes
+
+
+def _fingerprint_files(
+    repo_path: str,
+    rel_paths: List[str],
+    priors: List[Optional[Dict[str, Tuple[str, FunctionFingerprint]]]],
+    cached_digests: List[Optional[str]],
+) -> List[Optional[Tuple[str, Optional[Dict[str, FunctionFingerprint]], Optional[Dict[str, str]]]]]:
+    """
+    Run _fingerprint_file over `rel_paths` with the matching parse-cache
+    priors and cached digests, fanning out to a process pool when there are enough of
+    them. Workers read the files themselves, so no source text is held
+    for the whole batch or pickled across processes. Results come back
+    in the same order as `rel_paths`.
+
+    Only the main thread fans out. Scans started from the webhook server's
+    background threads run serially, so concurrent scans never each spawn
+    a full pool.
+    """
+    on_main_thread = threading.current_thread() is threading.main_thread()
+    if on_main_thread and len(rel_paths) >= _PARALLEL_MIN_FILES:
+        workers = os.cpu_count() or 1
+        chunksize = max(1, len(rel_paths) // (4 * workers))
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+                return list(pool.map(
+                    _fingerprint_file,
+                    [repo_path] * len(rel_paths),
+                    rel_paths,
+                    priors,
+                    cached_digests,
+                    chunksize=chunksize,
+                ))
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            print(f"[docrot] Warning: parallel scan unavailable ({e}); scanning serially.")
+    return [
+        _fingerprint_file(repo_path, rel_path, prior, cached_digest)
+        for rel_path, prior, cached_digest in zip(rel_paths, priors, cached_digests)
+    ]
+
+
 def _scan_repo(
-    repo_path: str, py_files: List[str]
+    repo_path: str,
+    py_files: List[str],
 ) -> tuple[Dict[str, Dict[str, FunctionFingerprint]], List[str]]:
     """
     Return ({rel_file_path: {stable_id: FunctionFingerprint}}, failed_files)
     for every .py file. Files that fail to read are tracked separately so
     we can avoid clobbering their stored fingerprints.
+
+    Unchanged files are served from the parse cache; the rest are
+    fingerprinted (in parallel for larger scans) and added to it. Within
+    a changed file, functions whose source is identical to the file's
+    previous cache entry reuse their cached fingerprint.
+
+    Files whose stat signature matches the cache are not read at all.
+    Every other file is read exactly once, by _fingerprint_file, which
+    also does the digest check against the cache, so only one file's
+    source is in memory at a time per worker.
     """
-    all_fps: Dict[str, Dict[str, FunctionFingerprint]] = {}
+    scanned: Dict[str, Dict[str, FunctionFingerprint]] = {}
     failed_files: List[str] = []
+    misses: List[str] = []
+    signatures: Dict[str, Optional[List[int]]] = {}
+    cache = ParseCache(repo_path)
     for rel_path in py_files:
-        source = _read_source(repo_path, rel_path)
-        if source is None:
+        signature = file_signature(os.path.join(repo_path, rel_path))
+        cached = cache.lookup_stat(rel_path, signature)
+        if cached is not None:
+            scanned[rel_path] = cached
+            continue
+        misses.append(rel_path)
+        signatures[rel_path] = signature
+
+    priors = [cache.prior(rel_path) for rel_path in misses]
+    cached_digests = [cache.recorded_digest(rel_path) for rel_path in misses]
+    results = _fingerprint_files(repo_path, misses, priors, cached_digests)
+    for rel_path, result in zip(misses, results):
+        if result is None:
             failed_files.append(rel_path)
             continue
-        file_fps = extract_function_fingerprints(source, rel_path)
-        if file_fps:
-            all_fps[rel_path] = file_fps
+        digest, file_fps, source_hashes = result
+        # A digest hit (file_fps is None) is served from the cache.
+        cached = cache.lookup(digest, rel_path, signatures[rel_path])
+        if cached is not None:
+            scanned[rel_path] = cached
+            continue
+        cache.store(digest, rel_path, file_fps, signatures[rel_path], source_hashes)
+        scanned[rel_path] = file_fps
+    cache.save()
+    if cache.hits:
+        print(f"[docrot] Parse cache: {cache.hits} unchanged file(s) reused, "
+              f"{cache.misses} re-parsed.")
+
+    # Keep the deterministic py_files order and drop files with no functions.
+    all_fps = {
+        rel_path: scanned[rel_path]
+        for rel_path in py_files
+        if scanned.get(rel_path)
+    }
     return all_fps, failed_files
 
 
@@ -195,7 +330,7 @@ def _make_suggestion(reason: FlagReason, fn_id: str) -> str:
 
 def _change_events_to_flags(
     events: List[ChangeEvent],
-    old_fps: Dict[str, Dict[str, FunctionFingerprint]],
+    old_fps: Mapping[str, Dict[str, FunctionFingerprint]],
     new_fps: Dict[str, Dict[str, FunctionFingerprint]],
     doc_mappings: Optional[List[Dict]] = None,
 ) -> List[Flag]:
@@ -208,7 +343,8 @@ def _change_events_to_flags(
     """
     flags: List[Flag] = []
     # Import locally to avoid a circular-import risk at module load.
-    from src.config import docs_for_code_path
+    from src.config import compile_doc_mappings
+    docs_for_code_path = compile_doc_mappings(doc_mappings or [])
 
     # Priority order — prefer reasons the deterministic patch generator can
     # handle (signature/parameter/return/symbol) over the generic
@@ -270,7 +406,7 @@ def _change_events_to_flags(
         # has no doc_file to patch.
         doc_ref: Optional[DocReference] = None
         if doc_mappings:
-            mapped_docs = docs_for_code_path(event.code_path, doc_mappings)
+            mapped_docs = docs_for_code_path(event.code_path)
             if mapped_docs:
                 doc_ref = DocReference(
                     file_path=mapped_docs[0],
@@ -298,8 +434,7 @@ def _change_events_to_flags(
         flags.append(flag)
 
     # Sort HIGH → MEDIUM → LOW
-    order = {Severity.HIGH: 0, Severity.MEDIUM: 1, Severity.LOW: 2}
-    flags.sort(key=lambda f: order[f.severity])
+    sort_flags_by_severity(flags)
     return flags
 
 
@@ -449,6 +584,7 @@ def run(repo_path: str, commit_hash: Optional[str] = None) -> int:
     config = load_config(repo_path)
     doc_mappings = get_doc_mappings(config)
     thresholds = get_thresholds(config)
+    storage = get_storage_backend(config)
 
     if not doc_mappings:
         print(
@@ -463,6 +599,13 @@ def run(repo_path: str, commit_hash: Optional[str] = None) -> int:
         print("[docrot] No Python files found. Exiting.")
         return 0
 
+    # Only the stored baseline's per-function hashes are read eagerly; a
+    # file's fingerprints are deserialized (or, for SQLite, fetched) only
+    # when that file actually differs from the scan.
+    stored_raw = load_fingerprints(repo_path, storage)
+    stored_hashes = fingerprint_hashes(stored_raw)
+    old_fps = DeserializedFingerprints(stored_raw)
+
     print(f"[docrot] Found {len(py_files)} Python file(s). Extracting fingerprints...")
     # FIX: _scan_repo now also returns a list of files that failed to read,
     # so we can avoid clobbering their stored fingerprints later.
@@ -472,13 +615,18 @@ def run(repo_path: str, commit_hash: Optional[str] = None) -> int:
     if failed_files:
         print(f"[docrot] Warning: {len(failed_files)} file(s) could not be read and will be skipped.")
 
-    # 3. First run — save baseline, no alerts
-    if is_first_run(repo_path):
+    # 3. First run — save baseline, no alerts. Decided from the baseline
+    #    loaded above (missing, unreadable or empty, as in is_first_run),
+    #    so the file is not read a second time.
+    if not stored_hashes:
         serialized = {
             fp: serialize_file_fingerprints(fps)
             for fp, fps in current_fps.items()
         }
-        baseline_stats = update_fingerprint_baseline(repo_path, serialized)
+        baseline_stats = update_fingerprint_baseline(
+            repo_path, serialized, storage, stored_hashes,
+        )
+        close_fingerprints(stored_raw)
         json_path = os.path.join(repo_path, ".docrot-report.json")
         txt_path = os.path.join(repo_path, ".docrot-report.txt")
         generate_reports(
@@ -497,26 +645,27 @@ def run(repo_path: str, commit_hash: Optional[str] = None) -> int:
         print(f"[docrot] Done in {time.time() - start:.2f}s.")
         return 0
 
-    # 4. Load baseline
-    stored_raw = load_fingerprints(repo_path)
-    old_fps: Dict[str, Dict[str, FunctionFingerprint]] = {
-        fp: deserialize_file_fingerprints(fp_dict)
-        for fp, fp_dict in stored_raw.items()
-    }
+    # 4. Baseline (loaded before the scan, above)
 
     # 5. Compare → ChangeEvents
     # Only compare files we successfully scanned; skip failed files entirely
-    # so their functions don't appear as spuriously removed.
+    # so their functions don't appear as spuriously removed. A file whose
+    # {stable_id: fingerprint_hash} matches the baseline yields no events,
+    # so its stored fingerprints are never loaded.
     all_events: List[ChangeEvent] = []
-    for file_path in sorted(set(old_fps) | set(current_fps)):
+    for file_path in sorted(stored_hashes.keys() | current_fps.keys()):
         if file_path in failed_files:
             continue
-        events = compare_file_functions(
+        new_funcs = current_fps.get(file_path, {})
+        if stored_hashes.get(file_path) == {
+            fn_id: fp.fingerprint_hash for fn_id, fp in new_funcs.items()
+        }:
+            continue
+        all_events.extend(iter_file_function_changes(
             old_fps.get(file_path, {}),
-            current_fps.get(file_path, {}),
+            new_funcs,
             file_path,
-        )
-        all_events.extend(events)
+        ))
 
     # 6. DocAlerts (alerts.py pipeline — maps events to doc files via config)
     doc_alerts = evaluate_doc_flags(all_events, doc_mappings, thresholds)
@@ -525,8 +674,7 @@ def run(repo_path: str, commit_hash: Optional[str] = None) -> int:
     #    FIX: Also include doc_alerts as flags so they appear in reports.
     flags = _change_events_to_flags(all_events, old_fps, current_fps, doc_mappings)
     flags += _doc_alerts_to_flags(doc_alerts)
-    order = {Severity.HIGH: 0, Severity.MEDIUM: 1, Severity.LOW: 2}
-    flags.sort(key=lambda f: order[f.severity])
+    sort_flags_by_severity(flags)
 
     # 8. AI suggestions (skipped if user set "ai": false in config)
     ai_disabled = is_ai_disabled(config)
@@ -597,16 +745,19 @@ def run(repo_path: str, commit_hash: Optional[str] = None) -> int:
         fp: serialize_file_fingerprints(fps)
         for fp, fps in current_fps.items()
     }
-    for file_path, fn_dict in serialized.items():
+    for file_path, fn_id in flagged_ids:
+        fn_dict = serialized.get(file_path)
         stored_file = stored_raw.get(file_path, {})
-        for fn_id in list(fn_dict.keys()):
-            if (file_path, fn_id) in flagged_ids and fn_id in stored_file:
-                fn_dict[fn_id] = stored_file[fn_id]
+        if fn_dict is not None and fn_id in fn_dict and fn_id in stored_file:
+            fn_dict[fn_id] = stored_file[fn_id]
     for failed_path in failed_files:
         if failed_path in stored_raw:
             serialized[failed_path] = stored_raw[failed_path]
 
-    baseline_stats = update_fingerprint_baseline(repo_path, serialized)
+    baseline_stats = update_fingerprint_baseline(
+        repo_path, serialized, storage, stored_hashes,
+    )
+    close_fingerprints(stored_raw)
     print(
         "[docrot] Fingerprints updated: "
         f"files +{baseline_stats['files_added']} "
@@ -0,0 +1,68 @@
+"""Tests for the comparator's scoring engine.
+
+Covered surface:
+    score_semantic_delta: the precomputed per-mask table agrees with
+    per-flag scoring for every combination of SemanticDelta flags
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields
+
+from src.comparator import (
+    SCORE_EXCEPTION_OR_CORE_PATH,
+    SCORE_FLOW_OR_RETURN,
+    SCORE_LITERAL_OR_DEFAULT,
+    SCORE_PUBLIC_API,
+    SCORE_SIDE_EFFECT_OR_AUTH,
+    score_semantic_delta,
+)
+from src.models import SemanticDelta
+
+
+# (flag, weight, reason, critical) in the order reasons are reported.
+FLAG_SCORES = [
+    ("literal_changed", SCORE_LITERAL_OR_DEFAULT, "literal/constant changed", False),
+    ("default_arg_changed", SCORE_LITERAL_OR_DEFAULT, "default argument changed", False),
+    ("condition_logic_changed", SCORE_FLOW_OR_RETURN, "branch condition changed", False),
+    ("loop_semantics_changed", SCORE_FLOW_OR_RETURN, "loop behavior changed", False),
+    ("return_logic_changed", SCORE_FLOW_OR_RETURN, "return behavior changed", False),
+    ("public_signature_changed", SCORE_PUBLIC_API, "public signature changed", True),
+    ("public_api_added_or_removed", SCORE_PUBLIC_API, "public API added/removed", True),
+    ("side_effect_changed", SCORE_SIDE_EFFECT_OR_AUTH, "side-effect behavior changed", True),
+    ("auth_or_permission_logic_changed", SCORE_SIDE_EFFECT_OR_AUTH,
+     "auth/permission logic changed", True),
+    ("exception_behavior_changed", SCORE_EXCEPTION_OR_CORE_PATH,
+     "exception behavior changed", True),
+    ("core_control_path_added_or_removed", SCORE_EXCEPTION_OR_CORE_PATH,
+     "core control path added/removed", True),
+]
+
+
+def _score_per_flag(delta):
+    """Reference scoring: check each flag in turn, as before the table."""
+    if delta.only_comment_or_formatting_changes:
+        return 0, ["format/comment only"], False
+    score, reasons, critical = 0, [], False
+    for flag, weight, reason, is_critical in FLAG_SCORES:
+        if getattr(delta, flag):
+            score += weight
+            reasons.append(reason)
+            critical = critical or is_critical
+    return score, reasons, critical
+
+
+def test_table_matches_per_flag_scoring_for_every_mask():
+    names = [f.name for f in fields(SemanticDelta)]
+    assert len(names) == len(FLAG_SCORES) + 1
+
+    for mask in range(1 << len(names)):
+        delta = SemanticDelta(**{name: bool(mask >> bit & 1) for bit, name in enumerate(names)})
+        score, reasons, critical = score_semantic_delta(delta)
+        assert (score, list(reasons), critical) == _score_per_flag(delta), delta
+
+
+def test_single_flags():
+    assert score_semantic_delta(SemanticDelta()) == (0, (), False)
+    for flag, weight, reason, critical in FLAG_SCORES:
+        assert score_semantic_delta(SemanticDelta(**{flag: True})) == (weight, (reason,), critical)
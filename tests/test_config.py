@@ -0,0 +1,87 @@
+"""Tests for config loading and validation.
+
+Covered surface:
+    invalid threshold warnings: once per load, again on the next load
+    docs_for_code_path: bucketed matcher agrees with a linear fnmatch scan
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+
+import pytest
+
+from src.config import docs_for_code_path, get_thresholds, load_config
+
+
+def _write_config(repo, data):
+    (repo / ".docrot-config.json").write_text(json.dumps(data))
+
+
+def test_invalid_threshold_is_reported_on_every_load(tmp_path, capsys):
+    _write_config(tmp_path, {"thresholds": {"per_function_substantial": 0}})
+
+    for _ in range(2):
+        config = load_config(str(tmp_path))
+        assert get_thresholds(config)["per_function_substantial"] == 4
+        warnings = [line for line in capsys.readouterr().out.splitlines()
+                    if "per_function_substantial" in line]
+        assert len(warnings) == 1
+
+
+PATTERNS = [
+    "*.py",
+    "**/*.py",
+    "?rc/*.py",
+    "*/auth/*.py",
+    "[st]*/*.py",
+    "src/*.py",
+    "src/**/test_*.py",
+    "src/auth/*.py",
+    "tests/*",
+    "setup.py",
+    "README.md",
+    "src",
+    "",
+]
+
+PATHS = [
+    "setup.py",
+    "src",
+    "src/app.py",
+    "src/auth/login.py",
+    "src/auth/tests/test_login.py",
+    "tests/test_app.py",
+    "lib/auth/token.py",
+    "a/b/c/d.py",
+    "README.md",
+    "src\\win.py",
+]
+
+
+def _linear_scan(code_path, doc_mappings):
+    """The matcher's reference: every glob tried in order with fnmatch."""
+    normalized_path = code_path.replace("\\", "/")
+    docs = []
+    for mapping in doc_mappings:
+        if fnmatch.fnmatch(normalized_path, mapping["code_glob"]):
+            docs.extend(d for d in mapping["docs"] if d not in docs)
+    return docs
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+@pytest.mark.parametrize("code_path", PATHS)
+def test_single_glob_matches_like_fnmatch(pattern, code_path):
+    mappings = [{"code_glob": pattern, "docs": ["doc.md"]}]
+    assert docs_for_code_path(code_path, mappings) == _linear_scan(code_path, mappings)
+
+
+@pytest.mark.parametrize("code_path", PATHS)
+def test_all_globs_give_fnmatch_docs_in_config_order(code_path):
+    mappings = [
+        {"code_glob": pattern, "docs": [f"doc{i}.md", "shared.md"]}
+        for i, pattern in enumerate(PATTERNS)
+    ]
+    mappings.reverse()
+    assert docs_for_code_path(code_path, mappings) == _linear_scan(code_path, mappings)
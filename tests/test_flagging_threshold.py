@@ -0,0 +1,64 @@
+"""Tests for parameter-change flagging.
+
+Covered surface:
+    check_parameter_changes: a single swapped parameter is PARAMETER_RENAMED;
+    swaps combined with additions or removals, and pure reorders, are not
+"""
+
+from __future__ import annotations
+
+from src.flagging_threshold import CodeElement, FlagReason, check_parameter_changes
+
+
+def _element(*params):
+    return CodeElement(
+        name="charge",
+        file_path="pkg/billing.py",
+        signature=f"def charge({', '.join(params)}):",
+        hash="",
+        params=list(params),
+        return_type=None,
+        docstring=None,
+    )
+
+
+def _reasons(flags):
+    return sorted(flag.reason.value for flag in flags)
+
+
+def test_single_parameter_renamed_in_place():
+    flags = check_parameter_changes(_element("order", "amount"), _element("order", "total"), None)
+
+    assert [flag.reason for flag in flags] == [FlagReason.PARAMETER_RENAMED]
+    assert "'amount' renamed to 'total'" in flags[0].message
+    assert flags[0].suggestion == "Replace 'amount' with 'total' in documentation."
+
+
+def test_swap_with_an_added_parameter_is_not_a_rename():
+    flags = check_parameter_changes(
+        _element("order", "amount"), _element("order", "total", "currency"), None
+    )
+
+    assert _reasons(flags) == sorted([
+        FlagReason.PARAMETER_ADDED.value,
+        FlagReason.PARAMETER_ADDED.value,
+        FlagReason.PARAMETER_REMOVED.value,
+    ])
+
+
+def test_swap_with_a_removed_parameter_is_not_a_rename():
+    flags = check_parameter_changes(
+        _element("order", "amount", "currency"), _element("order", "total"), None
+    )
+
+    assert _reasons(flags) == sorted([
+        FlagReason.PARAMETER_ADDED.value,
+        FlagReason.PARAMETER_REMOVED.value,
+        FlagReason.PARAMETER_REMOVED.value,
+    ])
+
+
+def test_reordered_parameters_are_not_flagged():
+    flags = check_parameter_changes(_element("order", "amount"), _element("amount", "order"), None)
+
+    assert flags == []
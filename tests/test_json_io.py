@@ -0,0 +1,41 @@
+"""Tests for the JSON artifact encoder.
+
+Covered surface:
+    dumps_pretty gives the same bytes with and without orjson
+    (non-ASCII text is written as UTF-8 by both)
+    dumps_compact: same bytes with and without orjson, no whitespace
+"""
+
+from __future__ import annotations
+
+import json
+
+from src import json_io
+
+
+DATA = {
+    "pkg/café.py": {
+        "pkg/café.py::charge": {"call_names": ["db.save", "naïve"], "return_count": 2},
+    },
+    "b": [True, None, -(2 ** 40), "tab\tand \"quote\""],
+}
+
+
+def test_fallback_matches_orjson_bytes(monkeypatch):
+    fast = json_io.dumps_pretty(DATA, sort_keys=True)
+    monkeypatch.setattr(json_io, "orjson", None)
+    fallback = json_io.dumps_pretty(DATA, sort_keys=True)
+
+    assert fallback == fast
+    assert "café".encode("utf-8") in fallback
+    assert json.loads(fallback) == DATA
+
+
+def test_compact_fallback_matches_orjson_bytes(monkeypatch):
+    fast = json_io.dumps_compact(DATA)
+    monkeypatch.setattr(json_io, "orjson", None)
+    fallback = json_io.dumps_compact(DATA)
+
+    assert fallback == fast
+    assert b"\n" not in fallback and b": " not in fallback
+    assert json.loads(fallback) == DATA
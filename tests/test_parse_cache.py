@@ -0,0 +1,160 @@
+"""Tests for the content-addressed parse cache.
+
+Covered surface:
+    ParseCache.get / put / save round-trip through the sidecar file
+    cache file placement inside the git directory (parse_cache_path)
+    extract_function_fingerprints(..., cache=...) hit and miss paths
+    invalidation when the source text changes
+    whole-file reuse of an unchanged file without parsing
+    per-function reuse from the previous entry of a changed file (prior)
+    stat-signature hits (lookup_stat) and the racy-mtime guard
+"""
+
+from __future__ import annotations
+
+import os
+
+from src.ast_parser import extract_function_fingerprints
+from src.parse_cache import (
+    GIT_PARSE_CACHE_FILENAME,
+    PARSE_CACHE_FILENAME,
+    ParseCache,
+    file_signature,
+    parse_cache_path,
+    source_digest,
+)
+
+
+SOURCE_V1 = '''
+def charge(order, amount):
+    if amount > 100:
+        db.save(order)
+    return order
+'''
+
+SOURCE_V2 = SOURCE_V1.replace("amount > 100", "amount >= 100")
+
+
+def test_cached_fingerprints_match_fresh_extraction(tmp_path):
+    fresh = extract_function_fingerprints(SOURCE_V1, "pkg/billing.py")
+
+    cache = ParseCache(str(tmp_path))
+    extract_function_fingerprints(SOURCE_V1, "pkg/billing.py", cache)
+    cache.save()
+    assert os.path.exists(tmp_path / PARSE_CACHE_FILENAME)
+
+    reloaded = ParseCache(str(tmp_path))
+    cached = extract_function_fingerprints(SOURCE_V1, "pkg/billing.py", reloaded)
+
+    assert reloaded.hits == 1 and reloaded.misses == 0
+    assert {sid: fp.to_dict() for sid, fp in cached.items()} == \
+        {sid: fp.to_dict() for sid, fp in fresh.items()}
+
+
+def test_cache_file_stays_out_of_git_worktrees(tmp_path):
+    repo = tmp_path / "repo"
+    (repo / ".git").mkdir(parents=True)
+    assert parse_cache_path(str(repo)) == str(repo / ".git" / GIT_PARSE_CACHE_FILENAME)
+
+    ParseCache(str(repo)).save()
+    assert not os.path.exists(repo / PARSE_CACHE_FILENAME)
+
+    # Linked worktrees and submodules have a .git file naming the git dir.
+    worktree = tmp_path / "worktree"
+    worktree.mkdir()
+    (worktree / ".git").write_text("gitdir: ../repo/.git\n")
+    assert parse_cache_path(str(worktree)) == \
+        os.path.join(str(worktree), "../repo/.git", GIT_PARSE_CACHE_FILENAME)
+
+
+def test_changed_source_or_path_is_a_miss(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    extract_function_fingerprints(SOURCE_V1, "pkg/billing.py", cache)
+
+    assert cache.get(SOURCE_V2, "pkg/billing.py") is None
+    assert cache.get(SOURCE_V1, "pkg/other.py") is None
+
+    updated = extract_function_fingerprints(SOURCE_V2, "pkg/billing.py", cache)
+    fp = updated["pkg/billing.py::charge"]
+    assert fp.conditions.comparison_ops == ["GtE"]
+
+
+def test_save_drops_entries_not_used_this_run(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    extract_function_fingerprints(SOURCE_V1, "pkg/a.py", cache)
+    extract_function_fingerprints(SOURCE_V1, "pkg/b.py", cache)
+    cache.save()
+
+    second = ParseCache(str(tmp_path))
+    extract_function_fingerprints(SOURCE_V1, "pkg/a.py", second)
+    second.save()
+
+    third = ParseCache(str(tmp_path))
+    assert third.get(SOURCE_V1, "pkg/a.py") is not None
+    assert third.get(SOURCE_V1, "pkg/b.py") is None
+
+
+def test_unchanged_file_is_served_without_parsing(tmp_path, monkeypatch):
+    import src.ast_parser as ast_parser
+
+    cache = ParseCache(str(tmp_path))
+    fps = extract_function_fingerprints(SOURCE_V1, "pkg/billing.py", cache)
+    cache.save()
+
+    def fail(_source):
+        raise AssertionError("unchanged file was re-parsed")
+
+    monkeypatch.setattr(ast_parser, "parse_source", fail)
+    reloaded = ParseCache(str(tmp_path))
+    reused = extract_function_fingerprints(SOURCE_V1, "pkg/billing.py", reloaded)
+    assert reused == fps
+    assert "file_hash" not in reused["pkg/billing.py::charge"].to_dict()
+
+
+def test_unchanged_functions_of_a_changed_file_are_reused(tmp_path, monkeypatch):
+    import src.ast_parser as ast_parser
+
+    source = SOURCE_V1 + "\n\ndef refund(order):\n    return order\n"
+    cache = ParseCache(str(tmp_path))
+    first = extract_function_fingerprints(source, "pkg/billing.py", cache)
+    cache.save()
+
+    built = []
+    real_build = ast_parser.build_fingerprint
+
+    def counting_build(fn_node, *args):
+        built.append(fn_node.name)
+        return real_build(fn_node, *args)
+
+    monkeypatch.setattr(ast_parser, "build_fingerprint", counting_build)
+    reloaded = ParseCache(str(tmp_path))
+    changed = source.replace("amount > 100", "amount >= 100")
+    second = extract_function_fingerprints(changed, "pkg/billing.py", reloaded)
+
+    assert built == ["charge"]
+    assert second["pkg/billing.py::refund"] == first["pkg/billing.py::refund"]
+    # The per-function source hashes stay in the cache, out of the baseline.
+    assert "source_hash" not in second["pkg/billing.py::refund"].to_dict()
+    assert set(reloaded.prior("pkg/billing.py")) == set(first)
+
+
+def test_stat_signature_hit_skips_digest_check(tmp_path):
+    src_file = tmp_path / "billing.py"
+    src_file.write_text(SOURCE_V1)
+    os.utime(src_file, ns=(1_000_000_000, 1_000_000_000))
+    signature = file_signature(str(src_file))
+
+    cache = ParseCache(str(tmp_path))
+    fps = extract_function_fingerprints(SOURCE_V1, "pkg/billing.py")
+    cache.store(source_digest(SOURCE_V1), "pkg/billing.py", fps, signature)
+    cache.save()
+
+    reloaded = ParseCache(str(tmp_path))
+    assert reloaded.lookup_stat("pkg/billing.py", signature) == fps
+    assert reloaded.lookup_stat("pkg/billing.py", [signature[0] + 1] + signature[1:]) is None
+
+    # Freshly modified files are never trusted on their stat alone.
+    src_file.write_text(SOURCE_V2)
+    fresh = file_signature(str(src_file))
+    reloaded.store(source_digest(SOURCE_V2), "pkg/billing.py", fps, fresh)
+    assert reloaded.lookup_stat("pkg/billing.py", fresh) is None
@@ -0,0 +1,99 @@
+"""Tests for the opt-in SQLite fingerprint baseline.
+
+Covered surface:
+    persistence.load/persist/is_first_run with storage="sqlite"
+    update_fingerprint_baseline stats against a SQLite baseline
+    incremental writes: unchanged files kept, vanished files dropped
+    fingerprint_hashes without decoding rows; closing the mapping
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from src.ast_parser import extract_function_fingerprints
+from src.persistence import (
+    fingerprint_hashes,
+    is_first_run,
+    load_fingerprints,
+    persist_fingerprints,
+    serialize_file_fingerprints,
+    update_fingerprint_baseline,
+)
+from src.persistence_sqlite import FINGERPRINT_DB_FILENAME
+
+
+SOURCE = '''
+def charge(order, amount):
+    if amount > 100:
+        db.save(order)
+    return order
+
+def refund(order):
+    return order
+'''
+
+
+def _baseline(source, path="pkg/billing.py"):
+    return {path: serialize_file_fingerprints(extract_function_fingerprints(source, path))}
+
+
+def test_round_trip_matches_json_shape(tmp_path):
+    repo = str(tmp_path)
+    baseline = _baseline(SOURCE)
+
+    assert is_first_run(repo, "sqlite")
+    persist_fingerprints(repo, baseline, "sqlite")
+    assert not is_first_run(repo, "sqlite")
+
+    loaded = load_fingerprints(repo, "sqlite")
+    assert list(loaded) == ["pkg/billing.py"]
+    assert "pkg/missing.py" not in loaded
+    assert dict(loaded.items()) == baseline
+
+
+def test_update_baseline_reports_changes(tmp_path):
+    repo = str(tmp_path)
+    persist_fingerprints(repo, _baseline(SOURCE), "sqlite")
+
+    changed = SOURCE.replace("amount > 100", "amount >= 100")
+    stats = update_fingerprint_baseline(repo, _baseline(changed), "sqlite")
+
+    assert stats["functions_changed"] == 1
+    assert stats["functions_unchanged"] == 1
+    assert dict(load_fingerprints(repo, "sqlite").items()) == _baseline(changed)
+
+
+def test_persist_only_rewrites_changed_files(tmp_path):
+    repo = str(tmp_path)
+    other = _baseline(SOURCE, "pkg/other.py")
+    persist_fingerprints(repo, {**_baseline(SOURCE), **other}, "sqlite")
+
+    def rowids(path):
+        with sqlite3.connect(str(tmp_path / FINGERPRINT_DB_FILENAME)) as conn:
+            return conn.execute(
+                "SELECT rowid FROM fingerprints WHERE file_path = ? ORDER BY rowid", (path,)
+            ).fetchall()
+
+    before = rowids("pkg/other.py")
+    changed = _baseline(SOURCE.replace("amount > 100", "amount >= 100"))
+    persist_fingerprints(repo, {**changed, **other}, "sqlite")
+    assert rowids("pkg/other.py") == before
+
+    persist_fingerprints(repo, changed, "sqlite")
+    assert dict(load_fingerprints(repo, "sqlite").items()) == changed
+
+
+def test_hashes_are_read_without_decoding_and_mapping_closes(tmp_path):
+    repo = str(tmp_path)
+    baseline = _baseline(SOURCE)
+    persist_fingerprints(repo, baseline, "sqlite")
+
+    loaded = load_fingerprints(repo, "sqlite")
+    with loaded:
+        assert fingerprint_hashes(loaded) == fingerprint_hashes(baseline)
+        assert loaded._files == {}
+    with pytest.raises(sqlite3.ProgrammingError):
+        loaded["pkg/billing.py"]